@@ -12,25 +12,40 @@ import platform
 import psutil
 import time
 import random
+import hashlib
+import json
+import multiprocessing
 from datetime import datetime, timedelta
+from functools import lru_cache
+from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import httpx
 import re
 import requests
 import base64
+import logging
 from urllib.parse import urlparse, parse_qs, unquote
 from io import BytesIO
 
 
+# Under discord's namespace so bot.run()'s default handler (on the "discord" logger, not
+# the root) also prints this module's messages without picking up httpx request logs
+logger = logging.getLogger("discord.8bit")
+
 app_dir = os.path.dirname(os.path.abspath(__file__))
 if app_dir not in sys.path:
     sys.path.insert(0, app_dir)
 
 from config import (
+    CONFIG,
+    validate_runtime_config,
     DISCORD_BOT_TOKEN,
     WEB_SERVER_URL_PRIMARY,
     WEB_SERVER_URL_FALLBACK,
     WEB_SERVER_SECRET,
     TEMP_DIR,
+    TEMP_DIR_STR,
     MAX_BUILD_FILE_SIZE
 )
 
@@ -41,6 +56,47 @@ STAFF_ROLE_ID = 1436606654924984370  # 8Bit Staff
 DEV_ROLE_ID = 1434956294984437942  # Developer role
 COOLDOWN_EXEMPT_ROLE_ID = 1436840291079557270  # Role immune to cooldowns
 
+_MEMBER_ROLE_IDS = frozenset({STAFF_ROLE_ID})
+_DEV_ROLE_IDS = frozenset({DEV_ROLE_ID})
+_COOLDOWN_EXEMPT_ROLE_IDS = frozenset({COOLDOWN_EXEMPT_ROLE_ID})
+
+# Static denial embeds, shared across commands (never mutated)
+_ACCESS_DENIED_EMBED = discord.Embed(
+    title="Access Denied",
+    description="You don't have permission to use this command.",
+    color=0xED4245
+)
+_OWNER_ONLY_EMBED = discord.Embed(
+    title="Access Denied",
+    description="Only the bot owner can use this command.",
+    color=0xED4245
+)
+
+def _err(title: str, description: str) -> discord.Embed:
+    """Build a red error embed"""
+    return discord.Embed(title=title, description=description, color=0xED4245)
+
+# Static *render error embeds (never mutated)
+_BUILDS_UNAVAILABLE_EMBED = _err("Error", "Unable to retrieve cached builds. Make sure the backend server is running.")
+_NO_CACHED_BUILDS_EMBED = _err("No Cached Builds", "No cached builds found. Please upload a build file instead.")
+_CORRUPT_BUILD_EMBED = _err("Error", "Invalid build data. The cached build may be corrupted.")
+_MISSING_INPUT_EMBED = _err("Missing Input", "Please provide either a build file attachment or an index number (e.g., `*render 5`). Use `*builds` to see available builds.")
+_INVALID_FILE_EMBED = _err("Invalid File", "Please upload a .Build or .build file.")
+_NO_BLOCKS_EMBED = _err("Render Error", "No blocks found in build file.")
+_SERVER_UNAVAILABLE_EMBED = _err("Web Server Unavailable", "The web server is currently unavailable. Please try again later.")
+_MEMORY_PRESSURE_EMBED = _err("Server Busy", "The server is low on memory right now. Please try again in a minute.")
+
+# Static validation error embeds for the utility commands (never mutated)
+_INVALID_SIDES_EMBED = _err("Invalid Sides", "Number of sides must be between 2 and 100.")
+_INVALID_COUNT_EMBED = _err("Invalid Count", "Number of dice must be between 1 and 10.")
+_NOT_ENOUGH_OPTIONS_EMBED = _err("Not Enough Options", "Please provide at least 2 options separated by commas.")
+_TOO_MANY_OPTIONS_EMBED = _err("Too Many Options", "Maximum 20 options allowed.")
+_INVALID_RANGE_EMBED = _err("Invalid Range", "Minimum value must be less than or equal to maximum value.")
+_RANGE_TOO_LARGE_EMBED = _err("Range Too Large", "Range cannot exceed 1,000,000.")
+_NOT_AN_IMAGE_EMBED = _err("Invalid File", "The provided file is not an image.")
+_NO_IMAGE_EMBED = _err("No Image Provided", "Please attach an image file.")
+_CDN_LINK_FAILED_EMBED = _err("Error", "Failed to get Discord CDN link.")
+
 from utils import (
     generate_model_id,
     upload_gltf_to_server,
@@ -49,13 +105,17 @@ from utils import (
     force_garbage_collection,
     get_usage_stats,
     get_cached_builds,
+    get_cached_build_by_index,
     delete_model_from_backend,
-    get_active_server_url
+    get_active_server_url,
+    check_build_cache,
+    memory_pressure_level,
+    MEMORY_NORMAL,
+    MEMORY_WARN,
+    MEMORY_CRITICAL,
+    get_http_client
 )
-from renderer import GLTFRenderer
-
-for item in TEMP_DIR.glob("*"):
-    cleanup_temp_files(item)
+from renderer import GLTFRenderer, export_blocks_to_gltf, limit_export_threads
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -64,6 +124,108 @@ tree = bot.tree  # Use the bot's built-in tree
 
 _commands_registered = False
 _bot_start_time = None
+_bot_start_monotonic = None  # For measuring uptime (immune to wall-clock jumps)
+_cpu_percent = 0.0  # CPU use over the poller's last 2s window (cpu_percent(interval=1) would block the loop)
+_sys_memory = None  # Latest psutil.virtual_memory() from _mem_poller
+_sys_disk = None  # Latest psutil.disk_usage('/') from _mem_poller
+_mem_poller_task = None
+_TEN_MIN = timedelta(minutes=10)  # Viewer link lifetime
+_UPLOAD_TIMEOUT = 60  # Seconds before a stuck GLTF upload is abandoned
+_bg_tasks = set()  # Strong refs so fire-and-forget tasks aren't garbage collected mid-run
+_inflight_renders = {}  # build_hash -> Future of the render currently producing it
+_inflight_lock = asyncio.Lock()
+# GLTF export holds the GIL (array packing, base64, JSON), so it runs in worker processes
+# rather than threads; workers are only started once an export is submitted. Few workers,
+# each with an equal share of numba's threads, so parallel kernels don't oversubscribe the
+# CPUs, started fresh (not forked) so they don't inherit the bot's event loop and sockets
+_EXPORT_WORKERS = min(2, os.cpu_count() or 1)
+_EXPORT_THREADS = max(1, (os.cpu_count() or 1) // _EXPORT_WORKERS)
+_EXPORT_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+def _new_export_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=_EXPORT_WORKERS,
+        mp_context=_EXPORT_CONTEXT,
+        initializer=limit_export_threads,
+        initargs=(_EXPORT_THREADS,),
+    )
+
+_export_pool = _new_export_pool()
+
+# Every possible 20-cell progress bar, indexed by filled cells
+_BARS = tuple("█" * i + "░" * (20 - i) for i in range(21))
+
+# Face ranges for every allowed die size (2-100), for random.choices
+_DICE_RANGES = {sides: range(1, sides + 1) for sides in range(2, 101)}
+_COIN = ("Heads", "Tails")
+
+def _progress_bar(pct: float) -> str:
+    """Render a 20-cell progress bar for a percentage"""
+    return _BARS[max(0, min(20, int(pct / 5)))]
+
+def _fmt_uptime(total_seconds: int) -> str:
+    """Format seconds as e.g. '2d 3h 4m 5s', omitting leading zero units"""
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    if days:
+        return f"{days}d {hours}h {minutes}m {seconds}s"
+    if hours:
+        return f"{hours}h {minutes}m {seconds}s"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+def _fmt_size(n: int) -> str:
+    """Format a byte count as B/KB/MB"""
+    return f"{n} B" if n < 1024 else f"{n / 1024:.1f} KB" if n < (1 << 20) else f"{n / (1 << 20):.1f} MB"
+
+_BUILD_ENTRY = "`{}.` **{}**\n   ID: `{}` | Size: {} | Created: {}"
+
+@lru_cache(maxsize=1024)
+def _fmt_created(created_at: str) -> str:
+    """Format a backend ISO timestamp as YYYY-MM-DD HH:MM (cached per timestamp)"""
+    if not created_at:
+        return "Unknown"
+    try:
+        return datetime.fromisoformat(created_at.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
+    except (ValueError, AttributeError):
+        return "Unknown"
+
+def _fmt_build_entry(i: int, build: dict) -> str:
+    """Format one numbered line of the cached builds list"""
+    filename = build.get('filename', 'Unknown')
+    if len(filename) > 30:
+        filename = filename[:27] + "..."
+    return _BUILD_ENTRY.format(
+        i,
+        filename,
+        build.get('id', 'Unknown'),
+        _fmt_size(build.get('size', 0)),
+        _fmt_created(build.get('created_at', ''))
+    )
+
+# Formatted *builds pages for the most recent builds list; get_cached_builds hands
+# back the same list until its TTL expires or a delete clears it, so a new list
+# object means the pages are stale
+_pages_source = None
+_pages_cache = {}
+
+def _builds_page_text(builds: list, page: int, items_per_page: int) -> str:
+    """Format one page of the cached builds list, reusing it while the list is unchanged"""
+    global _pages_source
+    if builds is not _pages_source:
+        _pages_cache.clear()
+        _pages_source = builds
+    text = _pages_cache.get((page, items_per_page))
+    if text is None:
+        start_idx = (page - 1) * items_per_page
+        end_idx = start_idx + items_per_page
+        text = "\n\n".join(map(_fmt_build_entry, range(start_idx + 1, end_idx + 1), builds[start_idx:end_idx]))
+        _pages_cache[(page, items_per_page)] = text
+    return text
 
 def generate_preview(model_id: str, gltf_url: str):
     try:
@@ -98,35 +260,195 @@ def generate_preview(model_id: str, gltf_url: str):
         print(f"❌ Flowkit generation failed: {e}")
         return None
 
-def has_member_access(user) -> bool:
-    """Check if user has member-level access (owner or staff role)"""
+def _spawn(coro) -> asyncio.Task:
+    """Schedule a fire-and-forget coroutine and keep it referenced until done"""
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+    return task
+
+def _cleanup_in_background(*paths: Path):
+    """Remove temp files on a worker thread without delaying the response"""
+    for path in paths:
+        _spawn(asyncio.to_thread(cleanup_temp_files, path))
+
+async def _export_gltf(renderer: GLTFRenderer, gltf_path: Path):
+    """Export a parsed build to gltf_path in a worker process; returns (center, max_size)"""
+    global _export_pool
+    # Only the block arrays are pickled to the worker, not the renderer and its raw source
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _export_pool, export_blocks_to_gltf, str(gltf_path), *renderer.export_arrays()
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); replace the pool so later exports can still run
+        _export_pool = _new_export_pool()
+        raise
+
+async def _dedupe_render(key, render):
+    """
+    Run render() once per key; concurrent callers with the same key await
+    the first caller's result instead of rendering and uploading again
+    """
+    async with _inflight_lock:
+        fut = _inflight_renders.get(key)
+        owner = fut is None
+        if owner:
+            fut = asyncio.get_running_loop().create_future()
+            # Mark the exception retrieved so a failure nobody waited on isn't logged twice
+            fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+            _inflight_renders[key] = fut
+    if not owner:
+        return await asyncio.shield(fut)
+    try:
+        result = await render()
+        fut.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        # Waiters get an error they can report; cancelling fut would raise CancelledError
+        # in them, which their `except Exception` handlers don't catch
+        fut.set_exception(RuntimeError("the identical render this was waiting on was cancelled"))
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        _inflight_renders.pop(key, None)
+
+async def _render_build(build_file, build_content: bytes, build_hash: str):
+    """
+    Render a build to GLTF (parsed straight from memory) and upload it
+    Returns (model_id, viewer_url), or None if the build has no blocks
+    """
+    model_id = generate_model_id()
+    renderer = GLTFRenderer(build_content)
+    # Parsing and export are CPU-bound; keep them off the event loop
+    await asyncio.to_thread(renderer.parse_build_file)
+
+    if len(renderer.positions) == 0:
+        return None
+
+    gltf_dir = TEMP_DIR / model_id
+    gltf_dir.mkdir(exist_ok=True)
+    gltf_path = gltf_dir / f"{model_id}.gltf"
+
+    try:
+        # Only the .gltf is uploaded; the web server serves the viewer page for it
+        await _export_gltf(renderer, gltf_path)
+
+        try:
+            viewer_url = await asyncio.wait_for(
+                upload_gltf_to_server(
+                    str(gltf_path),
+                    model_id,
+                    build_filename=build_file.filename,
+                    build_size=build_file.size,
+                    build_hash=build_hash
+                ),
+                timeout=_UPLOAD_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            # Reported to the user as the web server being unavailable
+            logger.warning("Upload of %s timed out after %ss", model_id, _UPLOAD_TIMEOUT)
+            viewer_url = None
+    finally:
+        # Runs on failure and timeout too, so temp dirs never outlive the render
+        _cleanup_in_background(gltf_dir)
+
+    if viewer_url:
+        # Seed the local cache so a re-upload hits before the backend list refreshes
+        get_cached_builds.cache_clear()
+        check_build_cache.cache_set(build_hash, value={
+            'model_id': model_id,
+            'id': model_id,
+            'filename': build_file.filename,
+            'size': build_file.size,
+            'build_hash': build_hash
+        })
+    return model_id, viewer_url
+
+_STALE_TEMP_AGE = 6 * 3600  # Seconds before an orphaned temp entry is swept
+
+def _cleanup_stale_temp_files(max_age: float = 0):
+    """Remove temp entries older than max_age seconds (all of them by default, e.g. after a crash)"""
+    cutoff = time.time() - max_age
+    with os.scandir(TEMP_DIR_STR) as entries:
+        for entry in entries:
+            if entry.name == _COMMAND_HASH_FILE.name:
+                continue
+            try:
+                if max_age and entry.stat(follow_symlinks=False).st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                # Removed by a render's own cleanup mid-scan
+                continue
+            # DirEntry caches the file type from readdir, so no extra stat per item
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                cleanup_temp_files(Path(entry.path))
+
+async def _temp_sweeper():
+    """Hourly sweep of temp entries left behind by crashed or abandoned renders"""
+    while True:
+        await asyncio.sleep(3600)
+        try:
+            await asyncio.to_thread(_cleanup_stale_temp_files, _STALE_TEMP_AGE)
+        except OSError as e:
+            logger.warning("Temp sweep failed: %s", e)
+
+async def _mem_poller():
+    """Refresh the system memory, disk and CPU stats /systeminfo reports, every 2 seconds"""
+    global _cpu_percent, _sys_memory, _sys_disk
+    while True:
+        _sys_memory = psutil.virtual_memory()
+        _sys_disk = psutil.disk_usage('/')
+        # Non-blocking: CPU use since the previous call
+        _cpu_percent = psutil.cpu_percent(interval=None)
+        await asyncio.sleep(2)
+
+def _detect_hosting_platform() -> str:
+    """Detect where the bot is hosted from its environment"""
+    if os.environ.get('RAILWAY_ENVIRONMENT'):
+        return "Railway"
+    if os.environ.get('HEROKU_APP_NAME'):
+        return "Heroku"
+    if os.environ.get('VERCEL'):
+        return "Vercel"
+    if os.path.exists('/.dockerenv'):
+        return "Docker"
+    return "Local"
+
+# Fixed for the life of the process
+_HOSTING_PLATFORM = _detect_hosting_platform()
+_PYTHON_VERSION = platform.python_version()
+_PLATFORM_INFO = platform.platform()
+_ENV_LABEL = os.environ.get('RAILWAY_ENVIRONMENT', 'Production' if _HOSTING_PLATFORM != 'Local' else 'Development')
+
+def _has_any_role(user, role_ids: frozenset) -> bool:
+    """Check if user is the owner or a member of the allowed guild holding one of role_ids"""
     if user.id == OWNER_ID:
         return True
     # Check if user is a Member (has roles) and is in the correct guild
     if isinstance(user, discord.Member):
         if user.guild and user.guild.id == ALLOWED_GUILD_ID:
-            return any(role.id == STAFF_ROLE_ID for role in user.roles)
+            # Checked against the member's current roles every time: without the privileged
+            # members intent on_member_update never fires, so a cached result could keep a
+            # revoked role working
+            return not role_ids.isdisjoint(role.id for role in user.roles)
     return False
 
+def has_member_access(user) -> bool:
+    """Check if user has member-level access (owner or staff role)"""
+    return _has_any_role(user, _MEMBER_ROLE_IDS)
+
 def has_dev_access(user) -> bool:
     """Check if user has developer-level access (owner or dev role)"""
-    if user.id == OWNER_ID:
-        return True
-    # Check if user is a Member (has roles) and is in the correct guild
-    if isinstance(user, discord.Member):
-        if user.guild and user.guild.id == ALLOWED_GUILD_ID:
-            return any(role.id == DEV_ROLE_ID for role in user.roles)
-    return False
+    return _has_any_role(user, _DEV_ROLE_IDS)
 
 def is_cooldown_exempt(user) -> bool:
     """Check if user is exempt from cooldowns"""
-    if user.id == OWNER_ID:
-        return True
-    # Check if user has the cooldown exempt role
-    if isinstance(user, discord.Member):
-        if user.guild and user.guild.id == ALLOWED_GUILD_ID:
-            return any(role.id == COOLDOWN_EXEMPT_ROLE_ID for role in user.roles)
-    return False
+    return _has_any_role(user, _COOLDOWN_EXEMPT_ROLE_IDS)
 
 # Store cooldowns per command
 _cooldown_storage = {}
@@ -162,6 +484,13 @@ def cooldown_with_exemption(rate: int, per: float, key=None):
     
     return app_commands.check(predicate)
 
+def member_check():
+    """
+    Slash command check for member access
+    Denials raise CheckFailure and are answered by on_app_command_error
+    """
+    return app_commands.check(lambda interaction: has_member_access(interaction.user))
+
 @tree.command(name="render", description="Render a build file to 3D and get a temporary viewer link", guild=discord.Object(id=ALLOWED_GUILD_ID))
 @app_commands.describe(
     build_file="Build file (.Build or .build) to render (optional if using index)",
@@ -174,12 +503,7 @@ async def render_command(
     index: int = None
 ):
     if not has_member_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     # Send immediate response to show the bot is working
@@ -196,64 +520,42 @@ async def render_command(
     # If index is provided, render from cache
     if index is not None:
         try:
-            builds_data = await get_cached_builds()
-            if not builds_data:
-                embed = discord.Embed(
-                    title="Error",
-                    description="Unable to retrieve cached builds. Make sure the backend server is running.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+            build_data = await get_cached_build_by_index(index)
+            if not build_data:
+                await preparing_message.edit(embed=_BUILDS_UNAVAILABLE_EMBED)
                 return
             
-            builds = builds_data.get('builds', [])
-            total_builds = len(builds)
+            total_builds = build_data['total']
             
             if total_builds == 0:
-                embed = discord.Embed(
-                    title="No Cached Builds",
-                    description="No cached builds found. Please upload a build file instead.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+                await preparing_message.edit(embed=_NO_CACHED_BUILDS_EMBED)
                 return
             
-            # Convert 1-based index to 0-based
-            if index < 1 or index > total_builds:
-                embed = discord.Embed(
-                    title="Invalid Index",
-                    description=f"Index must be between 1 and {total_builds}. Use `/builds` to see available builds.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+            build = build_data['build']
+            if index < 1 or index > total_builds or build is None:
+                await preparing_message.edit(embed=_err("Invalid Index", f"Index must be between 1 and {total_builds}. Use `/builds` to see available builds."))
                 return
             
-            # Get the build at the specified index (1-based to 0-based conversion)
-            build = builds[index - 1]
             model_id = build.get('id', 'Unknown')
             
             if not model_id or model_id == 'Unknown':
-                embed = discord.Embed(
-                    title="Error",
-                    description="Invalid build data. The cached build may be corrupted.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+                await preparing_message.edit(embed=_CORRUPT_BUILD_EMBED)
                 return
             
             # Get viewer URL from model_id
             server_url = await get_active_server_url()
             viewer_url = f"{server_url}/model?model_id={model_id}"
             
-            usage_stats = await get_usage_stats()
-            expiry_timestamp = int((datetime.now() + timedelta(minutes=10)).timestamp())
+            usage_stats = await get_usage_stats() or {}
+            now = discord.utils.utcnow()
+            expiry_timestamp = int((now + _TEN_MIN).timestamp())
             
             filename = build.get('filename', 'Unknown')
             embed = discord.Embed(
                 title="Build Rendered",
                 description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\n**Build:** {filename}\n**Model ID:** `{model_id}`\n\nExpires <t:{expiry_timestamp}:R>",
                 color=0x5865F2,
-                timestamp=datetime.now()
+                timestamp=now
             )
             
             storage_pct = usage_stats.get('storage_percent', 0)
@@ -267,46 +569,25 @@ async def render_command(
             return
             
         except Exception as e:
-            embed = discord.Embed(
-                title="Error",
-                description=f"An error occurred while loading cached build: {str(e)}",
-                color=0xED4245
-            )
-            await preparing_message.edit(embed=embed)
+            await preparing_message.edit(embed=_err("Error", f"An error occurred while loading cached build: {str(e)}"))
             return
     
     # If no index and no file, show error
     if build_file is None:
-        embed = discord.Embed(
-            title="Missing Input",
-            description="Please provide either a build file attachment or an index number from `/builds`.",
-            color=0xED4245
-        )
-        await preparing_message.edit(embed=embed)
+        await preparing_message.edit(embed=_err("Missing Input", "Please provide either a build file attachment or an index number from `/builds`."))
         return
     
     # Original file upload logic
-    if not build_file.filename.lower().endswith(('.build', '.Build')):
-        embed = discord.Embed(
-            title="Invalid File",
-            description="Please upload a .Build or .build file.",
-            color=0xED4245
-        )
-        await preparing_message.edit(embed=embed)
+    if not build_file.filename.lower().endswith('.build'):
+        await preparing_message.edit(embed=_INVALID_FILE_EMBED)
         return
     
     if build_file.size > MAX_BUILD_FILE_SIZE:
-        embed = discord.Embed(
-            title="File Too Large",
-            description=f"File size ({build_file.size / 1024 / 1024:.1f}MB) exceeds limit ({MAX_BUILD_FILE_SIZE / 1024 / 1024:.0f}MB).\nPlease use a smaller build file.",
-            color=0xED4245
-        )
-        await preparing_message.edit(embed=embed)
+        await preparing_message.edit(embed=_err("File Too Large", f"File size ({build_file.size / 1024 / 1024:.1f}MB) exceeds limit ({MAX_BUILD_FILE_SIZE / 1024 / 1024:.0f}MB).\nPlease use a smaller build file."))
         return
     
     try:
-        from utils import check_build_cache, write_file_async, calculate_memory_usage, calculate_build_hash
-        import psutil
+        from utils import check_build_cache, calculate_build_hash
 
         # Read build file content once and calculate SHA-1 hash
         build_content = await build_file.read()
@@ -325,146 +606,36 @@ async def render_command(
             viewer_url = f"{server_url}/model?model_id={model_id}"
             print(f"Cache hit: {build_file.filename} ({build_file.size} bytes) -> {model_id} (reused, no render, no R2 API call)")
         else:
-            # Check memory before processing
-            memory = psutil.virtual_memory()
-            estimated_memory = calculate_memory_usage(build_file.size)
-
-            # If memory is too high, wait a bit and check cache again (another user might have uploaded)
-            if memory.percent > 85:
-                await asyncio.sleep(0.5)  # Brief wait for concurrent uploads
-                cached = await check_build_cache(build_hash)
-                if cached:
-                    model_id = cached['model_id']
-                    server_url = await get_active_server_url()
-                    viewer_url = f"{server_url}/model?model_id={model_id}"
-                    print(f"Cache hit after wait: {build_file.filename} ({build_file.size} bytes) -> {model_id}")
-                else:
-                    # Still no cache, proceed with render
-                    build_path = TEMP_DIR / f"temp_{build_file.filename}"
-                    await write_file_async(build_path, build_content)
-
-                    model_id = generate_model_id()
-                    renderer = GLTFRenderer(str(build_path))
-                    renderer.parse_build_file()
-
-                    if len(renderer.positions) == 0:
-                        embed = discord.Embed(
-                            title="Render Error",
-                            description="No blocks found in build file.",
-                            color=0xED4245
-                        )
-                        await preparing_message.edit(embed=embed)
-                        cleanup_temp_files(build_path)
-                        return
-
-                    gltf_dir = TEMP_DIR / model_id
-                    gltf_dir.mkdir(exist_ok=True)
-                    gltf_path = gltf_dir / f"{model_id}.gltf"
-
-                    center, max_size = renderer.export_to_gltf(str(gltf_path))
-
-                    html_content = renderer.create_viewer_html(
-                        f"{model_id}.gltf",
-                        center,
-                        max_size,
-                        port=8000
-                    )
-                    html_path = gltf_dir / "index.html"
-                    await write_file_async(html_path, html_content.encode('utf-8'))
-
-                    # Check cache one more time before upload (catch concurrent duplicates)
-                    cached = await check_build_cache(build_hash)
-                    if cached:
-                        model_id = cached['model_id']
-                        server_url = await get_active_server_url()
-                        viewer_url = f"{server_url}/model?model_id={model_id}"
-                        print(f"Cache hit before upload: {build_file.filename} ({build_file.size} bytes) -> {model_id} (skipped R2 upload)")
-                        cleanup_temp_files(build_path)
-                        cleanup_temp_files(gltf_dir)
-                    else: #1
-                        # Upload (low-memory path)
-                        viewer_url = await upload_gltf_to_server(
-                            str(gltf_path),
-                            model_id,
-                            build_filename=build_file.filename,
-                            build_size=build_file.size,
-                            build_hash=build_hash
-                        )
-                        cleanup_temp_files(build_path)
-                        cleanup_temp_files(gltf_dir)
-            else:
-                # Memory is fine, proceed normally
-                build_path = TEMP_DIR / f"temp_{build_file.filename}"
-                await write_file_async(build_path, build_content)
-
-                model_id = generate_model_id()
-                renderer = GLTFRenderer(str(build_path))
-                renderer.parse_build_file()
-
-                if len(renderer.positions) == 0:
-                    embed = discord.Embed(
-                        title="Render Error",
-                        description="No blocks found in build file.",
-                        color=0xED4245
-                    )
-                    await preparing_message.edit(embed=embed)
-                    cleanup_temp_files(build_path)
-                    return
-
-                gltf_dir = TEMP_DIR / model_id
-                gltf_dir.mkdir(exist_ok=True)
-                gltf_path = gltf_dir / f"{model_id}.gltf"
-
-                center, max_size = renderer.export_to_gltf(str(gltf_path))
-
-                html_content = renderer.create_viewer_html(
-                    f"{model_id}.gltf",
-                    center,
-                    max_size,
-                    port=8000
-                )
-                html_path = gltf_dir / "index.html"
-                await write_file_async(html_path, html_content.encode('utf-8'))
-
-                # Check cache one more time before upload (catch concurrent duplicates)
-                cached = await check_build_cache(build_hash)
-                if cached:
-                    model_id = cached['model_id']
-                    server_url = await get_active_server_url()
-                    viewer_url = f"{server_url}/model?model_id={model_id}"
-                    print(f"Cache hit before upload: {build_file.filename} ({build_file.size} bytes) -> {model_id} (skipped R2 upload)")
-                    cleanup_temp_files(build_path)
-                    cleanup_temp_files(gltf_dir)
-                else: #2
-                    # Upload (low-memory path)
-                    viewer_url = await upload_gltf_to_server(
-                        str(gltf_path),
-                        model_id,
-                        build_filename=build_file.filename,
-                        build_size=build_file.size,
-                        build_hash=build_hash
-                    )
-                    cleanup_temp_files(build_path)
-                    cleanup_temp_files(gltf_dir)
+            # Refuse new renders while the host is thrashing, back off briefly when it's tight
+            pressure = memory_pressure_level()
+            if pressure == MEMORY_CRITICAL:
+                await preparing_message.edit(embed=_MEMORY_PRESSURE_EMBED)
+                return
+            if pressure == MEMORY_WARN:
+                await asyncio.sleep(0.5)
+
+            # Concurrent uploads of the same build, from /render or *render, share one render/upload
+            result = await _dedupe_render(
+                build_hash, lambda: _render_build(build_file, build_content, build_hash)
+            )
+            if result is None:
+                await preparing_message.edit(embed=_NO_BLOCKS_EMBED)
+                return
+            model_id, viewer_url = result
+
         if not viewer_url:
             server_available = await check_web_server_health()
             if server_available:
                 server_url = await get_active_server_url()
                 viewer_url = f"{server_url}/model?model_id={model_id}"
             else:
-                embed = discord.Embed(
-                    title="Web Server Unavailable",
-                    description="The web server is currently unavailable. Please try again later.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
-                cleanup_temp_files(build_path)
-                cleanup_temp_files(gltf_dir)
+                await preparing_message.edit(embed=_SERVER_UNAVAILABLE_EMBED)
                 force_garbage_collection()
                 return
 
-        usage_stats = await get_usage_stats()
-        expiry_timestamp = int((datetime.now() + timedelta(minutes=10)).timestamp())
+        usage_stats = await get_usage_stats() or {}
+        now = discord.utils.utcnow()
+        expiry_timestamp = int((now + _TEN_MIN).timestamp())
         
         # Get preview URL if available (from cache)
         preview_url = None
@@ -476,7 +647,7 @@ async def render_command(
             title="Build Rendered",
             description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
             color=0x5865F2,
-            timestamp=datetime.now()
+            timestamp=now
         )
         
         # Add preview image if available from cache
@@ -506,17 +677,10 @@ async def render_command(
                     gltf_url = f"{R2_PUBLIC_URL}/{model_id}.gltf"
                     
                     # Check if preview is ready from Flowkit (Flowkit caches renders, so this is fast)
-                    from utils import check_preview_ready, generate_preview_with_flowkit
-                    
-                    # Wait a bit for Flowkit to process if needed, then check
-                    max_attempts = 10
-                    attempt = 0
-                    preview_ready = False
+                    from utils import wait_for_preview_ready, generate_preview_with_flowkit
                     
-                    while attempt < max_attempts and not preview_ready:
-                        await asyncio.sleep(1)  # Wait 1 second between checks
-                        preview_ready = await check_preview_ready(gltf_url)
-                        attempt += 1
+                    # Wait for Flowkit to process if needed, backing off between checks
+                    preview_ready = await wait_for_preview_ready(gltf_url)
                     
                     if preview_ready:
                         # Generate and upload preview (Flowkit will use its cache if available)
@@ -527,18 +691,19 @@ async def render_command(
                             # Update cache with preview URL via API
                             try:
                                 server_url = await get_active_server_url()
-                                async with httpx.AsyncClient(timeout=10.0) as client:
-                                    response = await client.post(
-                                        f"{server_url}/api/generate-preview",
-                                        json={
-                                            'model_id': model_id,
-                                            'gltf_url': gltf_url
-                                        },
-                                        headers={
-                                            'X-API-Secret': WEB_SERVER_SECRET,
-                                            'Content-Type': 'application/json'
-                                        }
-                                    )
+                                client = get_http_client()
+                                response = await client.post(
+                                    f"{server_url}/api/generate-preview",
+                                    json={
+                                        'model_id': model_id,
+                                        'gltf_url': gltf_url
+                                    },
+                                    headers={
+                                        'X-API-Secret': WEB_SERVER_SECRET,
+                                        'Content-Type': 'application/json'
+                                    },
+                                    timeout=10.0
+                                )
                             except Exception as e:
                                 print(f"[Bot] Error updating cache with preview: {e}")
                             
@@ -549,7 +714,7 @@ async def render_command(
                                 title="Build Rendered",
                                 description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
                                 color=0x5865F2,
-                                timestamp=datetime.now()
+                                timestamp=now
                             )
                             new_embed.set_image(url=generated_preview_url)
                             new_embed.set_footer(
@@ -562,7 +727,7 @@ async def render_command(
                                 title="Build Rendered",
                                 description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
                                 color=0x5865F2,
-                                timestamp=datetime.now()
+                                timestamp=now
                             )
                             new_embed.set_footer(
                                 text=f"Preview unavailable | Storage: {storage_pct:.1f}% | A-class: {a_class_pct:.2f}% | B-class: {b_class_pct:.2f}%"
@@ -574,19 +739,17 @@ async def render_command(
                             title="Build Rendered",
                             description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
                             color=0x5865F2,
-                            timestamp=datetime.now()
+                            timestamp=now
                         )
                         new_embed.set_footer(
                             text=f"Preview unavailable | Storage: {storage_pct:.1f}% | A-class: {a_class_pct:.2f}% | B-class: {b_class_pct:.2f}%"
                         )
                         await preparing_message.edit(embed=new_embed)
                 except Exception as e:
-                    print(f"[Bot] Error in async preview generation: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("[Bot] Error in async preview generation: %s", e)
             
             # Start async preview generation
-            asyncio.create_task(generate_and_update_preview())
+            _spawn(generate_and_update_preview())
 
         force_garbage_collection()
         
@@ -597,9 +760,7 @@ async def render_command(
             color=0xED4245
         )
         await preparing_message.edit(embed=embed)
-        print(f"Render error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Render error: %s", e)
         force_garbage_collection()
 
 # Cooldown error handler for prefix commands
@@ -629,12 +790,7 @@ async def on_command_error(ctx, error):
 @tree.command(name="usage", description="View R2 storage usage statistics (Devs only)", guild=discord.Object(id=ALLOWED_GUILD_ID))
 async def usage_command(interaction: discord.Interaction):
     if not has_dev_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
@@ -658,9 +814,9 @@ async def usage_command(interaction: discord.Interaction):
     b_class_pct = usage_stats.get('b_class_percent', 0)
     month = usage_stats.get('month', 'Unknown')
     
-    storage_bar = "█" * int(storage_pct / 5) + "░" * (20 - int(storage_pct / 5))
-    a_class_bar = "█" * int(a_class_pct / 5) + "░" * (20 - int(a_class_pct / 5))
-    b_class_bar = "█" * int(b_class_pct / 5) + "░" * (20 - int(b_class_pct / 5))
+    storage_bar = _progress_bar(storage_pct)
+    a_class_bar = _progress_bar(a_class_pct)
+    b_class_bar = _progress_bar(b_class_pct)
     
     embed = discord.Embed(
         title="R2 Usage Statistics",
@@ -683,19 +839,14 @@ async def usage_command(interaction: discord.Interaction):
 async def builds_command(interaction: discord.Interaction, page: int = 1):
     """View cached builds with pagination"""
     if not has_dev_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
     
-    builds_data = await get_cached_builds()
+    builds = await get_cached_builds()
     
-    if not builds_data or not builds_data.get('success'):
+    if builds is None:
         embed = discord.Embed(
             title="Error",
             description="Unable to retrieve cached builds. Make sure the backend server is running.",
@@ -704,7 +855,6 @@ async def builds_command(interaction: discord.Interaction, page: int = 1):
         await interaction.followup.send(embed=embed, ephemeral=True)
         return
     
-    builds = builds_data.get('builds', [])
     total_builds = len(builds)
     
     if total_builds == 0:
@@ -728,37 +878,11 @@ async def builds_command(interaction: discord.Interaction, page: int = 1):
     end_idx = start_idx + items_per_page
     page_builds = builds[start_idx:end_idx]
     
-    build_list = []
-    for i, build in enumerate(page_builds, start=start_idx + 1):
-        filename = build.get('filename', 'Unknown')
-        size = build.get('size', 0)
-        model_id = build.get('id', 'Unknown')
-        created_at = build.get('created_at', '')
-        
-        if size < 1024:
-            size_str = f"{size} B"
-        elif size < 1024 * 1024:
-            size_str = f"{size / 1024:.1f} KB"
-        else:
-            size_str = f"{size / (1024 * 1024):.1f} MB"
-        
-        try:
-            if created_at:
-                dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                created_str = dt.strftime('%Y-%m-%d %H:%M')
-            else:
-                created_str = "Unknown"
-        except:
-            created_str = "Unknown"
-        
-        if len(filename) > 30:
-            filename = filename[:27] + "..."
-        
-        build_list.append(f"`{i}.` **{filename}**\n   ID: `{model_id}` | Size: {size_str} | Created: {created_str}")
+    build_list = "\n\n".join(map(_fmt_build_entry, range(start_idx + 1, end_idx + 1), page_builds))
     
     embed = discord.Embed(
         title="Cached Builds",
-        description="\n\n".join(build_list) if build_list else "No builds on this page.",
+        description=build_list or "No builds on this page.",
         color=0x5865F2,
         timestamp=datetime.now()
     )
@@ -780,20 +904,15 @@ async def builds_command(interaction: discord.Interaction, page: int = 1):
 async def list_duplicates_command(interaction: discord.Interaction):
     """List builds with duplicate file sizes"""
     if not has_dev_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     # Get cached builds
-    builds_data = await get_cached_builds()
+    builds = await get_cached_builds()
     
-    if not builds_data or not builds_data.get('success'):
+    if builds is None:
         embed = discord.Embed(
             title="Error",
             description="Unable to retrieve cached builds. Make sure the backend server is running.",
@@ -802,8 +921,6 @@ async def list_duplicates_command(interaction: discord.Interaction):
         await interaction.followup.send(embed=embed, ephemeral=True)
         return
     
-    builds = builds_data.get('builds', [])
-    
     size_groups = {}
     for build in builds:
         size = build.get('size', 0)
@@ -826,13 +943,7 @@ async def list_duplicates_command(interaction: discord.Interaction):
     # Format duplicate list
     duplicate_list = []
     for size, builds_list in sorted(duplicates.items(), key=lambda x: len(x[1]), reverse=True):
-        # Format file size
-        if size < 1024:
-            size_str = f"{size} B"
-        elif size < 1024 * 1024:
-            size_str = f"{size / 1024:.1f} KB"
-        else:
-            size_str = f"{size / (1024 * 1024):.1f} MB"
+        size_str = _fmt_size(size)
         
         build_names = []
         for build in builds_list:
@@ -864,12 +975,7 @@ async def delete_command(interaction: discord.Interaction, model_id: str):
     """Delete a model from R2 storage and API cache"""
     # Check if user is allowed
     if not has_dev_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
@@ -906,12 +1012,7 @@ async def delete_command(interaction: discord.Interaction, model_id: str):
 async def check_permissions_command(interaction: discord.Interaction, permission_type: str):
     """Check who has member or developer permissions"""
     if interaction.user.id != OWNER_ID:
-        embed = discord.Embed(
-            title="Access Denied",
-            description="Only the bot owner can use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_OWNER_ONLY_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
@@ -994,12 +1095,7 @@ async def check_permissions_command(interaction: discord.Interaction, permission
 async def grant_access_command(interaction: discord.Interaction, user: discord.Member, access_level: str):
     """Grant member or developer access to a user"""
     if interaction.user.id != OWNER_ID:
-        embed = discord.Embed(
-            title="Access Denied",
-            description="Only the bot owner can use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_OWNER_ONLY_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
@@ -1098,12 +1194,7 @@ async def grant_access_command(interaction: discord.Interaction, user: discord.M
 async def revoke_access_command(interaction: discord.Interaction, user: discord.Member, access_level: str):
     """Revoke member or developer access from a user"""
     if interaction.user.id != OWNER_ID:
-        embed = discord.Embed(
-            title="Access Denied",
-            description="Only the bot owner can use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_OWNER_ONLY_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
@@ -1208,12 +1299,7 @@ async def render_prefix(ctx, index: int = None):
     if ctx.guild.id != ALLOWED_GUILD_ID:
         return
     if not has_member_access(ctx.author):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_ACCESS_DENIED_EMBED)
         return
     
     # Send immediate response to show the bot is working
@@ -1227,64 +1313,42 @@ async def render_prefix(ctx, index: int = None):
     # If index is provided, render from cache
     if index is not None:
         try:
-            builds_data = await get_cached_builds()
-            if not builds_data:
-                embed = discord.Embed(
-                    title="Error",
-                    description="Unable to retrieve cached builds. Make sure the backend server is running.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+            build_data = await get_cached_build_by_index(index)
+            if not build_data:
+                await preparing_message.edit(embed=_BUILDS_UNAVAILABLE_EMBED)
                 return
             
-            builds = builds_data.get('builds', [])
-            total_builds = len(builds)
+            total_builds = build_data['total']
             
             if total_builds == 0:
-                embed = discord.Embed(
-                    title="No Cached Builds",
-                    description="No cached builds found. Please upload a build file instead.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+                await preparing_message.edit(embed=_NO_CACHED_BUILDS_EMBED)
                 return
             
-            # Convert 1-based index to 0-based
-            if index < 1 or index > total_builds:
-                embed = discord.Embed(
-                    title="Invalid Index",
-                    description=f"Index must be between 1 and {total_builds}. Use `*builds` to see available builds.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+            build = build_data['build']
+            if index < 1 or index > total_builds or build is None:
+                await preparing_message.edit(embed=_err("Invalid Index", f"Index must be between 1 and {total_builds}. Use `*builds` to see available builds."))
                 return
             
-            # Get the build at the specified index (1-based to 0-based conversion)
-            build = builds[index - 1]
             model_id = build.get('id', 'Unknown')
             
             if not model_id or model_id == 'Unknown':
-                embed = discord.Embed(
-                    title="Error",
-                    description="Invalid build data. The cached build may be corrupted.",
-                    color=0xED4245
-                )
-                await preparing_message.edit(embed=embed)
+                await preparing_message.edit(embed=_CORRUPT_BUILD_EMBED)
                 return
             
             # Get viewer URL from model_id
             server_url = await get_active_server_url()
             viewer_url = f"{server_url}/model?model_id={model_id}"
             
-            usage_stats = await get_usage_stats()
-            expiry_timestamp = int((datetime.now() + timedelta(minutes=10)).timestamp())
+            usage_stats = await get_usage_stats() or {}
+            now = discord.utils.utcnow()
+            expiry_timestamp = int((now + _TEN_MIN).timestamp())
             
             filename = build.get('filename', 'Unknown')
             embed = discord.Embed(
                 title="Build Rendered",
                 description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\n**Build:** {filename}\n**Model ID:** `{model_id}`\n\nExpires <t:{expiry_timestamp}:R>",
                 color=0x5865F2,
-                timestamp=datetime.now()
+                timestamp=now
             )
             
             storage_pct = usage_stats.get('storage_percent', 0)
@@ -1298,52 +1362,35 @@ async def render_prefix(ctx, index: int = None):
             return
             
         except Exception as e:
-            embed = discord.Embed(
-                title="Error",
-                description=f"An error occurred while loading cached build: {str(e)}",
-                color=0xED4245
-            )
-            await preparing_message.edit(embed=embed)
+            await preparing_message.edit(embed=_err("Error", f"An error occurred while loading cached build: {str(e)}"))
             return
     
     # If no index, check for file attachment
     if not ctx.message.attachments:
-        embed = discord.Embed(
-            title="Missing Input",
-            description="Please provide either a build file attachment or an index number (e.g., `*render 5`). Use `*builds` to see available builds.",
-            color=0xED4245
-        )
-        await preparing_message.edit(embed=embed)
+        await preparing_message.edit(embed=_MISSING_INPUT_EMBED)
         return
     
     build_file = ctx.message.attachments[0]
     
-    if not build_file.filename.lower().endswith(('.build', '.Build')):
-        embed = discord.Embed(
-            title="Invalid File",
-            description="Please upload a .Build or .build file.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+    if not build_file.filename.lower().endswith('.build'):
+        await ctx.send(embed=_INVALID_FILE_EMBED)
         return
     
     if build_file.size > MAX_BUILD_FILE_SIZE:
-        embed = discord.Embed(
-            title="File Too Large",
-            description=f"File size ({build_file.size / 1024 / 1024:.1f}MB) exceeds limit ({MAX_BUILD_FILE_SIZE / 1024 / 1024:.0f}MB).",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_err("File Too Large", f"File size ({build_file.size / 1024 / 1024:.1f}MB) exceeds limit ({MAX_BUILD_FILE_SIZE / 1024 / 1024:.0f}MB)."))
         return
     
+    did_render = False
     try:
-        from utils import check_build_cache, write_file_async, calculate_memory_usage, calculate_build_hash, get_active_server_url
-        import psutil
+        from utils import check_build_cache, calculate_build_hash
 
         # Read build file content once and calculate SHA-1 hash
         build_content = await build_file.read()
         build_hash = calculate_build_hash(build_content)
         
+        # Resolved only now, so input errors above don't wait on a cold health probe
+        server_url = await get_active_server_url()
+        
         # Check cache first using SHA-1 hash
         cached = await check_build_cache(build_hash)
 
@@ -1352,141 +1399,34 @@ async def render_prefix(ctx, index: int = None):
             # Get viewer URL directly from cache (gltf_url) - no API call needed!
             gltf_url = cached.get('gltf_url', cached.get('url'))
             # Construct viewer URL from model_id (gltf_url is stored but we use model_id for viewer)
-            server_url = await get_active_server_url()
             viewer_url = f"{server_url}/model?model_id={model_id}"
             print(f"Cache hit: {build_file.filename} ({build_file.size} bytes) -> {model_id} (reused, no render, no R2 API call)")
         else:
-            # Check memory before processing
-            memory = psutil.virtual_memory()
-            estimated_memory = calculate_memory_usage(build_file.size)
-
-            # If memory is too high, wait a bit and check cache again (another user might have uploaded)
-            if memory.percent > 85:
-                await asyncio.sleep(0.5)  # Brief wait for concurrent uploads
-                cached = await check_build_cache(build_hash)
-                if cached:
-                    model_id = cached['model_id']
-                    server_url = await get_active_server_url()
-                    viewer_url = f"{server_url}/model?model_id={model_id}"
-                    print(f"Cache hit after wait: {build_file.filename} ({build_file.size} bytes) -> {model_id}")
-                else:
-                    # Still no cache, proceed with render
-                    build_path = TEMP_DIR / f"temp_{build_file.filename}"
-                    await write_file_async(build_path, build_content)
-
-                    model_id = generate_model_id()
-                    renderer = GLTFRenderer(str(build_path))
-                    renderer.parse_build_file()
-
-                    if len(renderer.positions) == 0:
-                        embed = discord.Embed(
-                            title="Render Error",
-                            description="No blocks found in build file.",
-                            color=0xED4245
-                        )
-                        await preparing_message.edit(embed=embed)
-                        cleanup_temp_files(build_path)
-                        return
-
-                    gltf_dir = TEMP_DIR / model_id
-                    gltf_dir.mkdir(exist_ok=True)
-                    gltf_path = gltf_dir / f"{model_id}.gltf"
-
-                    center, max_size = renderer.export_to_gltf(str(gltf_path))
-
-                    html_content = renderer.create_viewer_html(
-                        f"{model_id}.gltf",
-                        center,
-                        max_size,
-                        port=8000
-                    )
-                    html_path = gltf_dir / "index.html"
-                    await write_file_async(html_path, html_content.encode('utf-8'))
-
-                    # Check cache one more time before upload (catch concurrent duplicates)
-                    cached = await check_build_cache(build_hash)
-                    if cached:
-                        model_id = cached['model_id']
-                        server_url = await get_active_server_url()
-                        viewer_url = f"{server_url}/model?model_id={model_id}"
-                        print(f"Cache hit before upload: {build_file.filename} ({build_file.size} bytes) -> {model_id} (skipped R2 upload)")
-                        cleanup_temp_files(build_path)
-                        cleanup_temp_files(gltf_dir)
-                    else: #3
-                        viewer_url = await upload_gltf_to_server(
-                            str(gltf_path),
-                            model_id,
-                            build_filename=build_file.filename,
-                            build_size=build_file.size,
-                            build_hash=build_hash
-                        )
-                        cleanup_temp_files(build_path)
-                        cleanup_temp_files(gltf_dir)
-            else:
-                # Memory is fine, proceed normally
-                build_path = TEMP_DIR / f"temp_{build_file.filename}"
-                await write_file_async(build_path, build_content)
-
-                model_id = generate_model_id()
-                renderer = GLTFRenderer(str(build_path))
-                renderer.parse_build_file()
-
-                if len(renderer.positions) == 0:
-                    embed = discord.Embed(
-                        title="Render Error",
-                        description="No blocks found in build file.",
-                        color=0xED4245
-                    )
-                    await preparing_message.edit(embed=embed)
-                    cleanup_temp_files(build_path)
-                    return
-
-                gltf_dir = TEMP_DIR / model_id
-                gltf_dir.mkdir(exist_ok=True)
-                gltf_path = gltf_dir / f"{model_id}.gltf"
-
-                center, max_size = renderer.export_to_gltf(str(gltf_path))
-
-                html_content = renderer.create_viewer_html(
-                    f"{model_id}.gltf",
-                    center,
-                    max_size,
-                    port=8000
-                )
-                html_path = gltf_dir / "index.html"
-                await write_file_async(html_path, html_content.encode('utf-8'))
-
-                # Check cache one more time before upload (catch concurrent duplicates)
-                cached = await check_build_cache(build_hash)
-                if cached:
-                    model_id = cached['model_id']
-                    server_url = await get_active_server_url()
-                    viewer_url = f"{server_url}/model?model_id={model_id}"
-                    print(f"Cache hit before upload: {build_file.filename} ({build_file.size} bytes) -> {model_id} (skipped R2 upload)")
-                    cleanup_temp_files(build_path)
-                    cleanup_temp_files(gltf_dir)
-                else: #4
-                    viewer_url = await upload_gltf_to_server(
-                        str(gltf_path),
-                        model_id,
-                        build_filename=build_file.filename,
-                        build_size=build_file.size,
-                        build_hash=build_hash
-                    )
-                    cleanup_temp_files(build_path)
-                    cleanup_temp_files(gltf_dir)
+            # Refuse new renders while the host is thrashing, back off briefly when it's tight
+            pressure = memory_pressure_level()
+            if pressure == MEMORY_CRITICAL:
+                await preparing_message.edit(embed=_MEMORY_PRESSURE_EMBED)
+                return
+            if pressure == MEMORY_WARN:
+                await asyncio.sleep(0.5)
 
-        if not viewer_url:
-            embed = discord.Embed(
-                title="Web Server Unavailable",
-                description="The web server is currently unavailable. Please try again later.",
-                color=0xED4245
+            # Concurrent uploads of the same build share one render/upload
+            did_render = True
+            result = await _dedupe_render(
+                build_hash, lambda: _render_build(build_file, build_content, build_hash)
             )
-            await preparing_message.edit(embed=embed)
+            if result is None:
+                await preparing_message.edit(embed=_NO_BLOCKS_EMBED)
+                return
+            model_id, viewer_url = result
+
+        if not viewer_url:
+            await preparing_message.edit(embed=_SERVER_UNAVAILABLE_EMBED)
             return
         
-        usage_stats = await get_usage_stats()
-        expiry_timestamp = int((datetime.now() + timedelta(minutes=10)).timestamp())
+        usage_stats = await get_usage_stats() or {}
+        now = discord.utils.utcnow()
+        expiry_timestamp = int((now + _TEN_MIN).timestamp())
         
         # Get preview URL if available (from cache)
         preview_url = None
@@ -1498,7 +1438,7 @@ async def render_prefix(ctx, index: int = None):
             title="Build Rendered",
             description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
             color=0x5865F2,
-            timestamp=datetime.now()
+            timestamp=now
         )
         
         # Add preview image if available from cache
@@ -1528,17 +1468,10 @@ async def render_prefix(ctx, index: int = None):
                     gltf_url = f"{R2_PUBLIC_URL}/{model_id}.gltf"
                     
                     # Check if preview is ready from Flowkit (Flowkit caches renders, so this is fast)
-                    from utils import check_preview_ready, generate_preview_with_flowkit
-                    
-                    # Wait a bit for Flowkit to process if needed, then check
-                    max_attempts = 10
-                    attempt = 0
-                    preview_ready = False
+                    from utils import wait_for_preview_ready, generate_preview_with_flowkit
                     
-                    while attempt < max_attempts and not preview_ready:
-                        await asyncio.sleep(1)  # Wait 1 second between checks
-                        preview_ready = await check_preview_ready(gltf_url)
-                        attempt += 1
+                    # Wait for Flowkit to process if needed, backing off between checks
+                    preview_ready = await wait_for_preview_ready(gltf_url)
                     
                     if preview_ready:
                         # Generate and upload preview (Flowkit will use its cache if available)
@@ -1548,19 +1481,19 @@ async def render_prefix(ctx, index: int = None):
                         if generated_preview_url:
                             # Update cache with preview URL via API
                             try:
-                                server_url = await get_active_server_url()
-                                async with httpx.AsyncClient(timeout=10.0) as client:
-                                    response = await client.post(
-                                        f"{server_url}/api/generate-preview",
-                                        json={
-                                            'model_id': model_id,
-                                            'gltf_url': gltf_url
-                                        },
-                                        headers={
-                                            'X-API-Secret': WEB_SERVER_SECRET,
-                                            'Content-Type': 'application/json'
-                                        }
-                                    )
+                                client = get_http_client()
+                                response = await client.post(
+                                    f"{server_url}/api/generate-preview",
+                                    json={
+                                        'model_id': model_id,
+                                        'gltf_url': gltf_url
+                                    },
+                                    headers={
+                                        'X-API-Secret': WEB_SERVER_SECRET,
+                                        'Content-Type': 'application/json'
+                                    },
+                                    timeout=10.0
+                                )
                             except Exception as e:
                                 print(f"[Bot] Error updating cache with preview: {e}")
                             
@@ -1571,7 +1504,7 @@ async def render_prefix(ctx, index: int = None):
                                 title="Build Rendered",
                                 description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
                                 color=0x5865F2,
-                                timestamp=datetime.now()
+                                timestamp=discord.utils.utcnow()
                             )
                             new_embed.set_image(url=generated_preview_url)
                             new_embed.set_footer(
@@ -1584,7 +1517,7 @@ async def render_prefix(ctx, index: int = None):
                                 title="Build Rendered",
                                 description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
                                 color=0x5865F2,
-                                timestamp=datetime.now()
+                                timestamp=discord.utils.utcnow()
                             )
                             new_embed.set_footer(
                                 text=f"Preview unavailable | Storage: {storage_pct:.1f}% | A-class: {a_class_pct:.2f}% | B-class: {b_class_pct:.2f}%"
@@ -1596,36 +1529,31 @@ async def render_prefix(ctx, index: int = None):
                             title="Build Rendered",
                             description=f"**Viewer:** [Open 3D Model]({viewer_url})\n\nExpires <t:{expiry_timestamp}:R>",
                             color=0x5865F2,
-                            timestamp=datetime.now()
+                            timestamp=discord.utils.utcnow()
                         )
                         new_embed.set_footer(
                             text=f"Preview unavailable | Storage: {storage_pct:.1f}% | A-class: {a_class_pct:.2f}% | B-class: {b_class_pct:.2f}%"
                         )
                         await preparing_message.edit(embed=new_embed)
                 except Exception as e:
-                    print(f"[Bot] Error in async preview generation: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("[Bot] Error in async preview generation: %s", e)
             
             # Start async preview generation
-            asyncio.create_task(generate_and_update_preview())
+            _spawn(generate_and_update_preview())
         
-        force_garbage_collection()
+        # A full collection is only worth it after a render, and only when memory is tight
+        if did_render and memory_pressure_level() != MEMORY_NORMAL:
+            force_garbage_collection()
         
     except Exception as e:
-        embed = discord.Embed(
-            title="Render Error",
-            description=f"An error occurred while rendering: {str(e)}",
-            color=0xED4245
-        )
+        embed = _err("Render Error", f"An error occurred while rendering: {str(e)}")
         try:
             await preparing_message.edit(embed=embed)
         except:
             await ctx.send(embed=embed)
-        print(f"Render error: {e}")
-        import traceback
-        traceback.print_exc()
-        force_garbage_collection()
+        logger.exception("Render error: %s", e)
+        if did_render and memory_pressure_level() != MEMORY_NORMAL:
+            force_garbage_collection()
 
 @bot.command(name="usage", aliases=["u"])
 async def usage_prefix(ctx):
@@ -1652,9 +1580,9 @@ async def usage_prefix(ctx):
     b_class_calls = usage_stats.get('b_class_calls', 0)
     b_class_pct = usage_stats.get('b_class_percent', 0)
     
-    storage_bar = "█" * int(storage_pct / 5) + "░" * (20 - int(storage_pct / 5))
-    a_class_bar = "█" * int(a_class_pct / 5) + "░" * (20 - int(a_class_pct / 5))
-    b_class_bar = "█" * int(b_class_pct / 5) + "░" * (20 - int(b_class_pct / 5))
+    storage_bar = _progress_bar(storage_pct)
+    a_class_bar = _progress_bar(a_class_pct)
+    b_class_bar = _progress_bar(b_class_pct)
     
     embed = discord.Embed(
         title="R2 Usage Statistics",
@@ -1677,9 +1605,9 @@ async def builds_prefix(ctx, page: int = 1):
         return
     
     await ctx.typing()
-    builds_data = await get_cached_builds()
+    builds = await get_cached_builds()
     
-    if not builds_data or not builds_data.get('success'):
+    if builds is None:
         embed = discord.Embed(
             title="Error",
             description="Unable to retrieve cached builds.",
@@ -1688,7 +1616,6 @@ async def builds_prefix(ctx, page: int = 1):
         await ctx.send(embed=embed)
         return
     
-    builds = builds_data.get('builds', [])
     total_builds = len(builds)
     
     if total_builds == 0:
@@ -1708,41 +1635,11 @@ async def builds_prefix(ctx, page: int = 1):
     elif page > total_pages:
         page = total_pages
     
-    start_idx = (page - 1) * items_per_page
-    end_idx = start_idx + items_per_page
-    page_builds = builds[start_idx:end_idx]
-    
-    build_list = []
-    for i, build in enumerate(page_builds, start=start_idx + 1):
-        filename = build.get('filename', 'Unknown')
-        size = build.get('size', 0)
-        model_id = build.get('id', 'Unknown')
-        created_at = build.get('created_at', '')
-        
-        if size < 1024:
-            size_str = f"{size} B"
-        elif size < 1024 * 1024:
-            size_str = f"{size / 1024:.1f} KB"
-        else:
-            size_str = f"{size / (1024 * 1024):.1f} MB"
-        
-        try:
-            if created_at:
-                dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                created_str = dt.strftime('%Y-%m-%d %H:%M')
-            else:
-                created_str = "Unknown"
-        except:
-            created_str = "Unknown"
-        
-        if len(filename) > 30:
-            filename = filename[:27] + "..."
-        
-        build_list.append(f"`{i}.` **{filename}**\n   ID: `{model_id}` | Size: {size_str} | Created: {created_str}")
+    build_list = _builds_page_text(builds, page, items_per_page)
     
     embed = discord.Embed(
         title="Cached Builds",
-        description="\n\n".join(build_list) if build_list else "No builds on this page.",
+        description=build_list or "No builds on this page.",
         color=0x5865F2,
         timestamp=datetime.now()
     )
@@ -1767,22 +1664,19 @@ async def list_duplicates_prefix(ctx):
         return
     
     await ctx.typing()
-    builds_data = await get_cached_builds()
+    builds = await get_cached_builds()
     
-    if not builds_data or not builds_data.get('success'):
+    if builds is None:
         await ctx.send("Unable to retrieve cached builds.")
         return
     
-    builds = builds_data.get('builds', [])
-    
-    size_groups = {}
-    for build in builds:
-        size = build.get('size', 0)
-        if size not in size_groups:
-            size_groups[size] = []
-        size_groups[size].append(build)
-    
-    duplicates = {size: builds_list for size, builds_list in size_groups.items() if len(builds_list) > 1}
+    # Count sizes first so only sizes shared by 2+ builds get a group list
+    sizes = [build.get('size', 0) for build in builds]
+    dup_sizes = {size for size, count in Counter(sizes).items() if count > 1}
+    duplicates = defaultdict(list)
+    for size, build in zip(sizes, builds):
+        if size in dup_sizes:
+            duplicates[size].append(build)
     
     if not duplicates:
         embed = discord.Embed(
@@ -1795,12 +1689,7 @@ async def list_duplicates_prefix(ctx):
     
     duplicate_list = []
     for size, builds_list in sorted(duplicates.items(), key=lambda x: len(x[1]), reverse=True):
-        if size < 1024:
-            size_str = f"{size} B"
-        elif size < 1024 * 1024:
-            size_str = f"{size / 1024:.1f} KB"
-        else:
-            size_str = f"{size / (1024 * 1024):.1f} MB"
+        size_str = _fmt_size(size)
         
         build_names = []
         for build in builds_list:
@@ -1957,34 +1846,23 @@ async def systeminfo_prefix(ctx):
     
     await ctx.typing()
     
-    # Detect hosting platform
-    hosting_platform = "Unknown"
-    if os.environ.get('RAILWAY_ENVIRONMENT'):
-        hosting_platform = "Railway"
-    elif os.environ.get('HEROKU_APP_NAME'):
-        hosting_platform = "Heroku"
-    elif os.environ.get('VERCEL'):
-        hosting_platform = "Vercel"
-    elif os.path.exists('/.dockerenv'):
-        hosting_platform = "Docker"
-    else:
-        hosting_platform = "Local"
+    hosting_platform = _HOSTING_PLATFORM
     
-    # System info
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
+    # System info (sampled in the background by _mem_poller)
+    cpu_percent = _cpu_percent
+    memory = _sys_memory or psutil.virtual_memory()
     memory_percent = memory.percent
     memory_used_gb = memory.used / (1024**3)
     memory_total_gb = memory.total / (1024**3)
     
-    disk = psutil.disk_usage('/')
+    disk = _sys_disk or psutil.disk_usage('/')
     disk_percent = disk.percent
     disk_used_gb = disk.used / (1024**3)
     disk_total_gb = disk.total / (1024**3)
     
     # Python info
-    python_version = platform.python_version()
-    platform_info = platform.platform()
+    python_version = _PYTHON_VERSION
+    platform_info = _PLATFORM_INFO
     
     # Bot info
     guild_count = len(bot.guilds)
@@ -1998,7 +1876,7 @@ async def systeminfo_prefix(ctx):
     
     embed.add_field(
         name="Hosting Platform",
-        value=f"**Platform:** {hosting_platform}\n**Environment:** {os.environ.get('RAILWAY_ENVIRONMENT', 'Production' if hosting_platform != 'Local' else 'Development')}",
+        value=f"**Platform:** {hosting_platform}\n**Environment:** {_ENV_LABEL}",
         inline=False
     )
     
@@ -2039,29 +1917,14 @@ async def image2link_prefix(ctx):
         if image.content_type and image.content_type.startswith('image/'):
             cdn_url = image.url
         else:
-            embed = discord.Embed(
-                title="Invalid File",
-                description="The provided file is not an image.",
-                color=0xED4245
-            )
-            await ctx.send(embed=embed)
+            await ctx.send(embed=_NOT_AN_IMAGE_EMBED)
             return
     else:
-        embed = discord.Embed(
-            title="No Image Provided",
-            description="Please attach an image file.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_NO_IMAGE_EMBED)
         return
     
     if not cdn_url:
-        embed = discord.Embed(
-            title="Error",
-            description="Failed to get Discord CDN link.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_CDN_LINK_FAILED_EMBED)
         return
     
     embed = discord.Embed(
@@ -2090,30 +1953,15 @@ async def image2link_prefix(ctx):
 async def random_command(interaction: discord.Interaction, min_value: int = 1, max_value: int = 100):
     """Generate a random number"""
     if not has_member_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     if min_value > max_value:
-        embed = discord.Embed(
-            title="Invalid Range",
-            description="Minimum value must be less than or equal to maximum value.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_INVALID_RANGE_EMBED, ephemeral=True)
         return
     
     if max_value - min_value > 1000000:
-        embed = discord.Embed(
-            title="Range Too Large",
-            description="Range cannot exceed 1,000,000.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_RANGE_TOO_LARGE_EMBED, ephemeral=True)
         return
     
     result = random.randint(min_value, max_value)
@@ -2132,15 +1980,10 @@ async def random_command(interaction: discord.Interaction, min_value: int = 1, m
 async def flip_command(interaction: discord.Interaction):
     """Flip a coin"""
     if not has_member_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
-    result = random.choice(["Heads", "Tails"])
+    result = _COIN[random.getrandbits(1)]
     emoji = "🪙" if result == "Heads" else "🪙"
     
     embed = discord.Embed(
@@ -2158,36 +2001,18 @@ async def flip_command(interaction: discord.Interaction):
     count="Number of dice to roll (default: 1, max: 10)"
 )
 @cooldown_with_exemption(5, 3.0, key=lambda i: (i.guild_id, i.user.id))  # 5 uses per 3 seconds (exempt role bypasses)
+@member_check()
 async def dice_command(interaction: discord.Interaction, sides: int = 6, count: int = 1):
     """Roll dice"""
-    if not has_member_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        return
-    
     if sides < 2 or sides > 100:
-        embed = discord.Embed(
-            title="Invalid Sides",
-            description="Number of sides must be between 2 and 100.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_INVALID_SIDES_EMBED, ephemeral=True)
         return
     
     if count < 1 or count > 10:
-        embed = discord.Embed(
-            title="Invalid Count",
-            description="Number of dice must be between 1 and 10.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_INVALID_COUNT_EMBED, ephemeral=True)
         return
     
-    results = [random.randint(1, sides) for _ in range(count)]
+    results = random.choices(_DICE_RANGES[sides], k=count)
     total = sum(results)
     
     results_str = ", ".join([str(r) for r in results])
@@ -2211,35 +2036,17 @@ async def dice_command(interaction: discord.Interaction, sides: int = 6, count:
     options="Options separated by commas (e.g., apple, banana, orange)"
 )
 @cooldown_with_exemption(5, 3.0, key=lambda i: (i.guild_id, i.user.id))  # 5 uses per 3 seconds (exempt role bypasses)
+@member_check()
 async def choose_command(interaction: discord.Interaction, options: str):
     """Choose randomly from options"""
-    if not has_member_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        return
-    
     choices = [opt.strip() for opt in options.split(",") if opt.strip()]
     
     if len(choices) < 2:
-        embed = discord.Embed(
-            title="Not Enough Options",
-            description="Please provide at least 2 options separated by commas.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_NOT_ENOUGH_OPTIONS_EMBED, ephemeral=True)
         return
     
     if len(choices) > 20:
-        embed = discord.Embed(
-            title="Too Many Options",
-            description="Maximum 20 options allowed.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_TOO_MANY_OPTIONS_EMBED, ephemeral=True)
         return
     
     chosen = random.choice(choices)
@@ -2260,24 +2067,12 @@ async def random_prefix(ctx, min_value: int = 1, max_value: int = 100):
     if ctx.guild.id != ALLOWED_GUILD_ID or not has_member_access(ctx.author):
         return
     
-    await ctx.typing()
-    
     if min_value > max_value:
-        embed = discord.Embed(
-            title="Invalid Range",
-            description="Minimum value must be less than or equal to maximum value.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_INVALID_RANGE_EMBED)
         return
     
     if max_value - min_value > 1000000:
-        embed = discord.Embed(
-            title="Range Too Large",
-            description="Range cannot exceed 1,000,000.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_RANGE_TOO_LARGE_EMBED)
         return
     
     result = random.randint(min_value, max_value)
@@ -2298,7 +2093,7 @@ async def flip_prefix(ctx):
     if ctx.guild.id != ALLOWED_GUILD_ID or not has_member_access(ctx.author):
         return
     
-    result = random.choice(["Heads", "Tails"])
+    result = _COIN[random.getrandbits(1)]
     emoji = "🪙"
     
     embed = discord.Embed(
@@ -2317,27 +2112,15 @@ async def dice_prefix(ctx, sides: int = 6, count: int = 1):
     if ctx.guild.id != ALLOWED_GUILD_ID or not has_member_access(ctx.author):
         return
     
-    await ctx.typing()
-    
     if sides < 2 or sides > 100:
-        embed = discord.Embed(
-            title="Invalid Sides",
-            description="Number of sides must be between 2 and 100.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_INVALID_SIDES_EMBED)
         return
     
     if count < 1 or count > 10:
-        embed = discord.Embed(
-            title="Invalid Count",
-            description="Number of dice must be between 1 and 10.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_INVALID_COUNT_EMBED)
         return
     
-    results = [random.randint(1, sides) for _ in range(count)]
+    results = random.choices(_DICE_RANGES[sides], k=count)
     total = sum(results)
     
     results_str = ", ".join([str(r) for r in results])
@@ -2363,26 +2146,14 @@ async def choose_prefix(ctx, *, options: str):
     if ctx.guild.id != ALLOWED_GUILD_ID or not has_member_access(ctx.author):
         return
     
-    await ctx.typing()
-    
     choices = [opt.strip() for opt in options.split(",") if opt.strip()]
     
     if len(choices) < 2:
-        embed = discord.Embed(
-            title="Not Enough Options",
-            description="Please provide at least 2 options separated by commas.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_NOT_ENOUGH_OPTIONS_EMBED)
         return
     
     if len(choices) > 20:
-        embed = discord.Embed(
-            title="Too Many Options",
-            description="Maximum 20 options allowed.",
-            color=0xED4245
-        )
-        await ctx.send(embed=embed)
+        await ctx.send(embed=_TOO_MANY_OPTIONS_EMBED)
         return
     
     chosen = random.choice(choices)
@@ -2396,87 +2167,101 @@ async def choose_prefix(ctx, *, options: str):
     
     await ctx.send(embed=embed)
 
+# Mention help field values, pre-rendered (each part stays under Discord's 1024-char field limit)
+_MEMBER_FIELD_VALUES = (
+    (
+        "`/render` - Render a build file to 3D\n"
+        "Aliases: `*r` • `*render` [Cooldown: 30s]\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/uptime` - View bot uptime\n"
+        "Aliases: `*ut` • `*uptime` [Cooldown: 10s (3x)]\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/credits` - View bot credits and information\n"
+        "Aliases: `*credits` • `*credit` • `*about`\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/image2link` - Convert image to Discord CDN link\n"
+        "Aliases: `*i2l` • `*image2link` [Cooldown: 10s (5x)]\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/random [min] [max]` - Generate a random number\n"
+        "Aliases: `*random` • `*rand` • `*rng` [Cooldown: 5s (3x)]\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/flip` - Flip a coin\n"
+        "Aliases: `*flip` • `*coin` • `*coinflip` [Cooldown: 3s (5x)]\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/dice [sides] [count]` - Roll dice\n"
+        "Aliases: `*d` • `*dice` • `*roll` [Cooldown: 3s (5x)]"
+    ),
+    (
+        "────────────────────────────────────────\n"
+        "`/choose <options>` - Choose randomly from options\n"
+        "Aliases: `*choose` • `*pick` • `*select` [Cooldown: 3s (5x)]"
+    ),
+)
+_DEV_FIELD_VALUES = (
+    (
+        "`/usage` - View R2 storage usage statistics\n"
+        "Aliases: `*u` • `*usage`\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/builds` - View cached builds with pagination\n"
+        "Aliases: `*b` • `*builds`\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/list-duplicates` - List builds with same file size\n"
+        "Aliases: `*ld` • `*list-duplicates`\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/delete <model_id>` - Delete a model from storage and cache\n"
+        "Aliases: `*del` • `*delete`\n"
+        "\n"
+        "────────────────────────────────────────\n"
+        "`/systeminfo` - View bot system information\n"
+        "Aliases: `*si` • `*systeminfo`"
+    ),
+)
+
+def _build_help_embed() -> discord.Embed:
+    """Build the mention help embed template (its fields are static, so this runs once at import)"""
+    embed = discord.Embed(
+        title="8Bit | Renderer - Commands",
+        description="Available commands for 8Bit Bot",
+        color=0x5865F2
+    )
+    
+    for i, value in enumerate(_MEMBER_FIELD_VALUES):
+        field_name = "👤 Member Commands" if i == 0 else "👤 Member Commands (cont.)"
+        embed.add_field(name=field_name, value=value, inline=False)
+    
+    for i, value in enumerate(_DEV_FIELD_VALUES):
+        field_name = "🔧 Developer Commands" if i == 0 else "🔧 Developer Commands (cont.)"
+        embed.add_field(name=field_name, value=value, inline=False)
+    
+    embed.set_footer(text="Mention @8Bit to see this help message")
+    
+    return embed
+
+_HELP_EMBED_TEMPLATE = _build_help_embed()
+
 @bot.event
 async def on_message(message: discord.Message):
     """Handle messages, including bot mentions for help"""
+    # Cheap attribute checks first; process_commands ignores bot authors too
+    if message.author.bot:
+        return
+    
     # Check if bot is mentioned
-    if bot.user in message.mentions and not message.author.bot:
-        if message.guild and message.guild.id == ALLOWED_GUILD_ID:
-            embed = discord.Embed(
-                title="8Bit | Renderer - Commands",
-                description="Available commands for 8Bit Bot",
-                color=0x5865F2,
-                timestamp=datetime.now()
-            )
-            
-            # Combined commands with aliases and cooldowns
-            commands_list = [
-                ("`/render`", "Render a build file to 3D", "MEMBER", ["*r", "*render"], "30s"),
-                ("`/usage`", "View R2 storage usage statistics", "DEVELOPER", ["*u", "*usage"], None),
-                ("`/builds`", "View cached builds with pagination", "DEVELOPER", ["*b", "*builds"], None),
-                ("`/list-duplicates`", "List builds with same file size", "DEVELOPER", ["*ld", "*list-duplicates"], None),
-                ("`/delete <model_id>`", "Delete a model from storage and cache", "DEVELOPER", ["*del", "*delete"], None),
-                ("`/uptime`", "View bot uptime", "MEMBER", ["*ut", "*uptime"], "10s (3x)"),
-                ("`/credits`", "View bot credits and information", "MEMBER", ["*credits", "*credit", "*about"], None),
-                ("`/systeminfo`", "View bot system information", "DEVELOPER", ["*si", "*systeminfo"], None),
-                ("`/image2link`", "Convert image to Discord CDN link", "MEMBER", ["*i2l", "*image2link"], "10s (5x)"),
-                ("`/random [min] [max]`", "Generate a random number", "MEMBER", ["*random", "*rand", "*rng"], "5s (3x)"),
-                ("`/flip`", "Flip a coin", "MEMBER", ["*flip", "*coin", "*coinflip"], "3s (5x)"),
-                ("`/dice [sides] [count]`", "Roll dice", "MEMBER", ["*d", "*dice", "*roll"], "3s (5x)"),
-                ("`/choose <options>`", "Choose randomly from options", "MEMBER", ["*choose", "*pick", "*select"], "3s (5x)"),
-            ]
-            
-            # Separate commands by access level
-            member_commands = [cmd for cmd in commands_list if cmd[2] == "MEMBER"]
-            developer_commands = [cmd for cmd in commands_list if cmd[2] == "DEVELOPER"]
-            
-            # Format commands into a string, splitting if needed
-            def format_commands(commands_list, max_length=1024):
-                """Format commands into a string, splitting if needed"""
-                parts = []
-                current_part = []
-                current_length = 0
-                
-                for i, cmd_data in enumerate(commands_list):
-                    cmd, desc, level, aliases, cooldown = cmd_data
-                    alias_str = " • ".join([f"`{alias}`" for alias in aliases])
-                    # Clean format: command - description (Aliases: ...) [Cooldown: ...]
-                    cooldown_text = f" [Cooldown: {cooldown}]" if cooldown else ""
-                    # Add divider between commands (except for the first one)
-                    divider = "────────────────────────────────────────\n" if i > 0 else ""
-                    # Use proper markdown formatting without nested italics
-                    command_text = f"{divider}{cmd} - {desc}\nAliases: {alias_str}{cooldown_text}\n\n"
-                    command_length = len(command_text)
-                    
-                    # If adding this command would exceed max_length, start a new part
-                    if current_length + command_length > max_length and current_part:
-                        parts.append("".join(current_part).rstrip())
-                        current_part = []
-                        current_length = 0
-                    
-                    current_part.append(command_text)
-                    current_length += command_length
-                
-                # Add the last part if it exists
-                if current_part:
-                    parts.append("".join(current_part).rstrip())
-                
-                return parts
-            
-            # Format member commands
-            member_parts = format_commands(member_commands)
-            for i, part in enumerate(member_parts):
-                field_name = "👤 Member Commands" if i == 0 else "👤 Member Commands (cont.)"
-                embed.add_field(name=field_name, value=part, inline=False)
-            
-            # Format developer commands
-            developer_parts = format_commands(developer_commands)
-            for i, part in enumerate(developer_parts):
-                field_name = "🔧 Developer Commands" if i == 0 else "🔧 Developer Commands (cont.)"
-                embed.add_field(name=field_name, value=part, inline=False)
-            
-            embed.set_footer(text="Mention @8Bit to see this help message")
-            
+    guild = message.guild
+    if guild is not None and guild.id == ALLOWED_GUILD_ID:
+        mentions = message.mentions
+        if mentions and bot.user in mentions:
+            embed = _HELP_EMBED_TEMPLATE.copy()
+            embed.timestamp = datetime.now()
             await message.channel.send(embed=embed)
     
     # Process commands normally
@@ -2484,36 +2269,17 @@ async def on_message(message: discord.Message):
 
 @tree.command(name="uptime", description="View bot uptime", guild=discord.Object(id=ALLOWED_GUILD_ID))
 @cooldown_with_exemption(3, 10.0, key=lambda i: (i.guild_id, i.user.id))  # 3 uses per 10 seconds (exempt role bypasses)
+@member_check()
 async def uptime_command(interaction: discord.Interaction):
     """View bot uptime"""
-    if not has_member_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        return
-    
     await interaction.response.defer(ephemeral=True)
     
-    if _bot_start_time is None:
+    if _bot_start_monotonic is None:
         uptime_seconds = 0
     else:
-        uptime_seconds = int(time.time() - _bot_start_time)
+        uptime_seconds = int(time.monotonic() - _bot_start_monotonic)
     
-    days = uptime_seconds // 86400
-    hours = (uptime_seconds % 86400) // 3600
-    minutes = (uptime_seconds % 3600) // 60
-    seconds = uptime_seconds % 60
-    
-    uptime_str = f"{days}d {hours}h {minutes}m {seconds}s"
-    if days == 0:
-        uptime_str = f"{hours}h {minutes}m {seconds}s"
-    if days == 0 and hours == 0:
-        uptime_str = f"{minutes}m {seconds}s"
-    if days == 0 and hours == 0 and minutes == 0:
-        uptime_str = f"{seconds}s"
+    uptime_str = _fmt_uptime(uptime_seconds)
     
     embed = discord.Embed(
         title="Bot Uptime",
@@ -2581,44 +2347,28 @@ async def credits_command(interaction: discord.Interaction):
 async def systeminfo_command(interaction: discord.Interaction):
     """View bot system information"""
     if not has_dev_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
     
-    # Detect hosting platform
-    hosting_platform = "Unknown"
-    if os.environ.get('RAILWAY_ENVIRONMENT'):
-        hosting_platform = "Railway"
-    elif os.environ.get('HEROKU_APP_NAME'):
-        hosting_platform = "Heroku"
-    elif os.environ.get('VERCEL'):
-        hosting_platform = "Vercel"
-    elif os.path.exists('/.dockerenv'):
-        hosting_platform = "Docker"
-    else:
-        hosting_platform = "Local"
+    hosting_platform = _HOSTING_PLATFORM
     
-    # System info
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
+    # System info (sampled in the background by _mem_poller)
+    cpu_percent = _cpu_percent
+    memory = _sys_memory or psutil.virtual_memory()
     memory_percent = memory.percent
     memory_used_gb = memory.used / (1024**3)
     memory_total_gb = memory.total / (1024**3)
     
-    disk = psutil.disk_usage('/')
+    disk = _sys_disk or psutil.disk_usage('/')
     disk_percent = disk.percent
     disk_used_gb = disk.used / (1024**3)
     disk_total_gb = disk.total / (1024**3)
     
     # Python info
-    python_version = platform.python_version()
-    platform_info = platform.platform()
+    python_version = _PYTHON_VERSION
+    platform_info = _PLATFORM_INFO
     
     # Bot info
     guild_count = len(bot.guilds)
@@ -2632,7 +2382,7 @@ async def systeminfo_command(interaction: discord.Interaction):
     
     embed.add_field(
         name="Hosting Platform",
-        value=f"**Platform:** {hosting_platform}\n**Environment:** {os.environ.get('RAILWAY_ENVIRONMENT', 'Production' if hosting_platform != 'Local' else 'Development')}",
+        value=f"**Platform:** {hosting_platform}\n**Environment:** {_ENV_LABEL}",
         inline=False
     )
     
@@ -2656,77 +2406,93 @@ async def systeminfo_command(interaction: discord.Interaction):
     
     await interaction.followup.send(embed=embed, ephemeral=True)
 
-async def extract_image_url(url: str) -> str:
+def extract_image_url(url: str) -> str:
+    # Direct links (CDN, attachments) carry no redirect target, so skip parsing
+    if 'google.com/url' not in url and 'url=' not in url:
+        return url
     try:
         parsed = urlparse(url)
-        query_params = parse_qs(parsed.query)
-        
-        if 'google.com/url' in url:
-            if 'url' in query_params:
-                actual_url = unquote(query_params['url'][0])
-                return actual_url
-        
-        if 'gstatic.com' in url or 'googleusercontent.com' in url:
-            return url
-        
-        if 'url=' in url:
-            for param_name in ['url', 'image', 'src', 'link']:
-                if param_name in query_params:
-                    potential_url = unquote(query_params[param_name][0])
-                    if potential_url.startswith(('http://', 'https://')):
-                        return potential_url
-        
+    except ValueError:
+        # Malformed netloc (e.g. an unbalanced IPv6 bracket)
         return url
-    except:
+    query_params = parse_qs(parsed.query)
+    
+    if 'google.com/url' in url:
+        if 'url' in query_params:
+            actual_url = unquote(query_params['url'][0])
+            return actual_url
+    
+    if 'gstatic.com' in url or 'googleusercontent.com' in url:
         return url
+    
+    if 'url=' in url:
+        for param_name in ['url', 'image', 'src', 'link']:
+            if param_name in query_params:
+                potential_url = unquote(query_params[param_name][0])
+                if potential_url.startswith(('http://', 'https://')):
+                    return potential_url
+    
+    return url
+
+_MAX_IMAGE_BYTES = 25 * 1024 * 1024  # Cap on downloaded image size
+
+def _sniff_image_type(head) -> str:
+    """Detect an image MIME type from its magic bytes, or '' if unrecognised"""
+    if head.startswith(b'\x89PNG'):
+        return 'image/png'
+    if head.startswith(b'\xff\xd8'):
+        return 'image/jpeg'
+    if head.startswith((b'GIF89a', b'GIF87a')):
+        return 'image/gif'
+    if head.startswith(b'RIFF') and head.startswith(b'WEBP', 8):
+        return 'image/webp'
+    return ''
 
 async def download_image_from_url(url: str) -> tuple[BytesIO, str]:
     try:
-        actual_url = await extract_image_url(url)
+        actual_url = extract_image_url(url)
         
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.get(actual_url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Referer': 'https://www.google.com/'
-            })
+        client = get_http_client()
+        async with client.stream('GET', actual_url, headers={
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': 'https://www.google.com/'
+        }, follow_redirects=True, timeout=30.0) as response:
             response.raise_for_status()
             
-            if len(response.content) == 0:
-                raise ValueError("Downloaded image is empty")
-            
-            content = response.content
-            is_image = False
-            content_type = response.headers.get('content-type', '').split(';')[0].strip()
-            
-            if content[:4] == b'\x89PNG':
-                is_image = True
-                content_type = 'image/png'
-            elif content[:2] == b'\xff\xd8':
-                is_image = True
-                content_type = 'image/jpeg'
-            elif content[:6] == b'GIF89a' or content[:6] == b'GIF87a':
-                is_image = True
-                content_type = 'image/gif'
-            elif content[:4] == b'RIFF' and content[8:12] == b'WEBP':
-                is_image = True
-                content_type = 'image/webp'
-            elif content_type.startswith('image/'):
-                is_image = True
-            else:
-                if content_type.startswith('image/'):
-                    is_image = True
-                else:
-                    raise ValueError("URL does not point to a valid image")
+            declared_size = response.headers.get('content-length', '')
+            if declared_size.isdigit() and int(declared_size) > _MAX_IMAGE_BYTES:
+                raise ValueError("Image is too large")
+            header_type = response.headers.get('content-type', '').split(';')[0].strip()
+            if not header_type.startswith('image/'):
+                header_type = ''
             
-            if not is_image:
+            # Read in chunks so non-images are rejected after the first chunk and size is capped
+            content = bytearray()
+            content_type = None
+            async for chunk in response.aiter_bytes(64 * 1024):
+                content += chunk
+                if len(content) > _MAX_IMAGE_BYTES:
+                    raise ValueError("Image is too large")
+                if content_type is None and len(content) >= 12:
+                    content_type = _sniff_image_type(content) or header_type
+                    if not content_type:
+                        raise ValueError("URL does not point to a valid image")
+        
+        if len(content) == 0:
+            raise ValueError("Downloaded image is empty")
+        
+        if content_type is None:
+            # Body was shorter than the longest signature
+            content_type = _sniff_image_type(content) or header_type
+            if not content_type:
                 raise ValueError("URL does not point to a valid image")
-            
-            image_data = BytesIO(content)
-            image_data.seek(0)  # Reset to beginning
-            
-            return image_data, content_type
+        
+        image_data = BytesIO(content)
+        image_data.seek(0)  # Reset to beginning
+        
+        return image_data, content_type
     except httpx.HTTPError as e:
         raise ValueError(f"HTTP error downloading image: {str(e)}")
     except Exception as e:
@@ -2737,17 +2503,9 @@ async def download_image_from_url(url: str) -> tuple[BytesIO, str]:
     image="Image attachment to convert"
 )
 @cooldown_with_exemption(5, 10.0, key=lambda i: (i.guild_id, i.user.id))  # 5 uses per 10 seconds (exempt role bypasses)
+@member_check()
 async def image2link_command(interaction: discord.Interaction, image: discord.Attachment = None):
     """Convert image to Discord CDN link"""
-    if not has_member_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        return
-    
     await interaction.response.defer()
     
     cdn_url = None
@@ -2755,12 +2513,7 @@ async def image2link_command(interaction: discord.Interaction, image: discord.At
     # Check if image attachment is provided
     if image:
         if not image.content_type or not image.content_type.startswith('image/'):
-            embed = discord.Embed(
-                title="Invalid File",
-                description="The provided file is not an image.",
-                color=0xED4245
-            )
-            await interaction.followup.send(embed=embed)
+            await interaction.followup.send(embed=_NOT_AN_IMAGE_EMBED)
             return
         cdn_url = image.url
     else:
@@ -2770,29 +2523,14 @@ async def image2link_command(interaction: discord.Interaction, image: discord.At
             if image.content_type and image.content_type.startswith('image/'):
                 cdn_url = image.url
             else:
-                embed = discord.Embed(
-                    title="Invalid File",
-                    description="The provided file is not an image.",
-                    color=0xED4245
-                )
-                await interaction.followup.send(embed=embed)
+                await interaction.followup.send(embed=_NOT_AN_IMAGE_EMBED)
                 return
         else:
-            embed = discord.Embed(
-                title="No Image Provided",
-                description="Please attach an image file.",
-                color=0xED4245
-            )
-            await interaction.followup.send(embed=embed)
+            await interaction.followup.send(embed=_NO_IMAGE_EMBED)
             return
     
     if not cdn_url:
-        embed = discord.Embed(
-            title="Error",
-            description="Failed to get Discord CDN link.",
-            color=0xED4245
-        )
-        await interaction.followup.send(embed=embed)
+        await interaction.followup.send(embed=_CDN_LINK_FAILED_EMBED)
         return
     
     embed = discord.Embed(
@@ -2811,15 +2549,9 @@ async def image2link_command(interaction: discord.Interaction, image: discord.At
     
     await interaction.followup.send(embed=embed)
 
-@render_command.error
-@random_command.error
-@flip_command.error
-@dice_command.error
-@choose_command.error
-@uptime_command.error
-@image2link_command.error
-async def cooldown_error_handler(interaction: discord.Interaction, error: app_commands.AppCommandError):
-    """Handle cooldown errors for slash commands"""
+@tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    """Handle cooldown and access check errors for all slash commands"""
     if isinstance(error, app_commands.CommandOnCooldown):
         # Check if user is exempt from cooldowns
         if is_cooldown_exempt(interaction.user):
@@ -2838,14 +2570,42 @@ async def cooldown_error_handler(interaction: discord.Interaction, error: app_co
             await interaction.followup.send(embed=embed, ephemeral=True)
         else:
             await interaction.response.send_message(embed=embed, ephemeral=True)
+    elif isinstance(error, app_commands.CheckFailure):
+        # member_check() denied access (checked after CommandOnCooldown, which subclasses CheckFailure)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
     else:
-        raise error
+        command = interaction.command
+        logger.error("Ignoring exception in command %r", command.name if command else None, exc_info=error)
+
+@bot.event
+async def setup_hook():
+    """Start background tasks before connecting to the gateway"""
+    global _mem_poller_task
+    _mem_poller_task = asyncio.create_task(_mem_poller())
+    _spawn(asyncio.to_thread(_cleanup_stale_temp_files))
+    _spawn(_temp_sweeper())
+    # Create the shared backend HTTP client on the bot's event loop
+    get_http_client()
+
+_COMMAND_HASH_FILE = TEMP_DIR / "command_hash"  # Fingerprint of the last command set synced to the guild
+
+def _command_set_fingerprint(guild) -> str:
+    """Hash the tree's guild commands so unchanged sets can skip syncing"""
+    payload = []
+    for cmd in tree.get_commands(guild=guild):
+        try:
+            payload.append(cmd.to_dict(tree))
+        except TypeError:
+            # discord.py < 2.4 takes no tree argument
+            payload.append(cmd.to_dict())
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
 
 @bot.event
 async def on_ready():
     """Called when bot is ready"""
-    global _bot_start_time
+    global _bot_start_time, _bot_start_monotonic
     _bot_start_time = time.time()
+    _bot_start_monotonic = time.monotonic()
     
     print(f"{bot.user} has connected to Discord!")
     print(f"Bot ID: {bot.user.id}")
@@ -2855,6 +2615,15 @@ async def on_ready():
     try:
         guild = discord.Object(id=ALLOWED_GUILD_ID)
         
+        # Skip the fetch/sync/verify round trips when the command set is unchanged since the last sync
+        command_hash = _command_set_fingerprint(guild)
+        try:
+            if _COMMAND_HASH_FILE.read_text().strip() == command_hash:
+                print("✓ Slash commands unchanged since last sync, skipping sync")
+                return
+        except OSError:
+            pass
+        
         # Wait a bit for Discord to be ready
         await asyncio.sleep(2)
         
@@ -2906,6 +2675,10 @@ async def on_ready():
             print("ERROR: No commands synced! This indicates a serious sync issue.")
         else:
             print(f"✓ Successfully registered {len(synced)} command(s)!")
+            try:
+                _COMMAND_HASH_FILE.write_text(command_hash)
+            except OSError as write_error:
+                print(f"Could not save command hash: {write_error}")
             
         # Double-check for duplicates (both guild and global)
         await asyncio.sleep(2)
@@ -2943,33 +2716,27 @@ async def on_ready():
             print(f"Could not verify commands: {check_error}")
             
     except Exception as e:
-        print(f"Error syncing commands: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error syncing commands: %s", e)
 
 @tree.command(name="clearnopreviewcache", description="Clear cached builds with no preview URL (Devs only)", guild=discord.Object(id=ALLOWED_GUILD_ID))
 async def clear_no_preview_cache_command(interaction: discord.Interaction):
     """Clear cached builds that have no preview URL"""
     if not has_dev_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     try:
         server_url = await get_active_server_url()
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{server_url}/api/clear-cache",
-                headers={
-                    'X-API-Secret': WEB_SERVER_SECRET
-                }
-            )
+        client = get_http_client()
+        response = await client.post(
+            f"{server_url}/api/clear-cache",
+            headers={
+                'X-API-Secret': WEB_SERVER_SECRET
+            },
+            timeout=10.0
+        )
             
         if response.status_code == 200:
             data = response.json()
@@ -3003,25 +2770,21 @@ async def clear_no_preview_cache_command(interaction: discord.Interaction):
 async def check_cache_command(interaction: discord.Interaction):
     """Check cache statistics"""
     if not has_dev_access(interaction.user):
-        embed = discord.Embed(
-            title="Access Denied",
-            description="You don't have permission to use this command.",
-            color=0xED4245
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=_ACCESS_DENIED_EMBED, ephemeral=True)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     try:
         server_url = await get_active_server_url()
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{server_url}/api/cache-stats",
-                headers={
-                    'X-API-Secret': WEB_SERVER_SECRET
-                }
-            )
+        client = get_http_client()
+        response = await client.get(
+            f"{server_url}/api/cache-stats",
+            headers={
+                'X-API-Secret': WEB_SERVER_SECRET
+            },
+            timeout=10.0
+        )
             
         if response.status_code == 200:
             data = response.json()
@@ -3071,8 +2834,14 @@ async def check_cache_command(interaction: discord.Interaction):
         await interaction.followup.send(embed=embed, ephemeral=True)
 
 def main():
-    if not DISCORD_BOT_TOKEN:
-        exit(1)
+    validate_runtime_config(CONFIG)
+    
+    # libuv-backed event loop for faster gateway/HTTP I/O (not available on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     
     bot.run(DISCORD_BOT_TOKEN)
 
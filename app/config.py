@@ -1,35 +1,152 @@
 import os
+import functools
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 
-DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN", "").strip()
-WEB_SERVER_SECRET = os.getenv("WEB_SERVER_SECRET", "").strip()
+_DEFAULT_MAX_BUILD_FILE_SIZE = 30 * 1024 * 1024  # 30MB
 
-WEB_SERVER_URL_PRIMARY = os.getenv("WEB_SERVER_URL_PRIMARY", "").strip()
-WEB_SERVER_URL_FALLBACK = os.getenv("WEB_SERVER_URL_FALLBACK", "").strip()
+# Environment variables read by get_config(), all whitespace-stripped
+_ENV_KEYS = (
+    "DISCORD_BOT_TOKEN",
+    "WEB_SERVER_SECRET",
+    "WEB_SERVER_URL_PRIMARY",
+    "WEB_SERVER_URL_FALLBACK",
+    "R2_ACCOUNT_ID",
+    "R2_ACCESS_KEY_ID",
+    "R2_SECRET_ACCESS_KEY",
+    "R2_BUCKET_NAME",
+    "R2_PUBLIC_URL",
+    "MAX_BUILD_FILE_SIZE",
+)
 
-WEB_SERVER_URL = os.getenv("WEB_SERVER_URL", WEB_SERVER_URL_PRIMARY).strip()
-if WEB_SERVER_URL != WEB_SERVER_URL_PRIMARY:
-    WEB_SERVER_URL_PRIMARY = WEB_SERVER_URL
 
-MAX_BUILD_FILE_SIZE = 30 * 1024 * 1024  # 30MB - maximum build file size for Discord uploads
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Environment-derived settings, read once per process"""
+    discord_bot_token: str
+    web_server_secret: str
+    web_server_url_primary: str
+    web_server_url_fallback: str
+    r2_account_id: str
+    r2_access_key_id: str
+    r2_secret_access_key: str
+    r2_bucket_name: str
+    r2_public_url: str
+    max_build_file_size: int
 
-R2_ACCOUNT_ID = os.getenv("R2_ACCOUNT_ID", "")
-R2_ACCESS_KEY_ID = os.getenv("R2_ACCESS_KEY_ID", "")
-R2_SECRET_ACCESS_KEY = os.getenv("R2_SECRET_ACCESS_KEY", "")
-R2_BUCKET_NAME = os.getenv("R2_BUCKET_NAME", "")
-R2_ENDPOINT_URL = f"https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
-R2_PUBLIC_URL = os.getenv("R2_PUBLIC_URL", "")
+
+def _parse_dotenv(path: Path) -> dict:
+    """Parse KEY=VALUE lines from a .env file (comments, blank lines and "export " allowed)"""
+    values = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[7:].lstrip()
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        values[key.strip()] = value
+    return values
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> MappingProxyType:
+    """Read-only snapshot of os.environ merged over ./.env, built once per process"""
+    raw = {}
+    dotenv = Path(".env")
+    if dotenv.is_file():
+        raw.update(_parse_dotenv(dotenv))
+    # Real environment variables take precedence over .env
+    raw.update(os.environ)
+    return MappingProxyType(raw)
+
+
+def _parse_size(raw: str) -> int | None:
+    """A positive byte count from raw, or None if it isn't one (e.g. "30MB")"""
+    try:
+        size = int(raw)
+    except ValueError:
+        return None
+    return size if size > 0 else None
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Build the Config from the process-wide environment snapshot"""
+    # Plain dict lookups from here on, no per-key os.getenv calls
+    env = _load_env()
+    values = {key: env.get(key, "").strip() for key in _ENV_KEYS}
+
+    return Config(
+        discord_bot_token=values["DISCORD_BOT_TOKEN"],
+        web_server_secret=values["WEB_SERVER_SECRET"],
+        # WEB_SERVER_URL, when set, overrides the primary URL
+        web_server_url_primary=env.get("WEB_SERVER_URL", values["WEB_SERVER_URL_PRIMARY"]).strip(),
+        web_server_url_fallback=values["WEB_SERVER_URL_FALLBACK"],
+        r2_account_id=values["R2_ACCOUNT_ID"],
+        r2_access_key_id=values["R2_ACCESS_KEY_ID"],
+        r2_secret_access_key=values["R2_SECRET_ACCESS_KEY"],
+        r2_bucket_name=values["R2_BUCKET_NAME"],
+        r2_public_url=values["R2_PUBLIC_URL"],
+        # A malformed value falls back to the default here; validate_runtime_config reports it
+        max_build_file_size=_parse_size(values["MAX_BUILD_FILE_SIZE"]) or _DEFAULT_MAX_BUILD_FILE_SIZE,
+    )
+
+
+CONFIG = get_config()
+
+DISCORD_BOT_TOKEN = CONFIG.discord_bot_token
+WEB_SERVER_SECRET = CONFIG.web_server_secret
+
+WEB_SERVER_URL_PRIMARY = CONFIG.web_server_url_primary
+WEB_SERVER_URL_FALLBACK = CONFIG.web_server_url_fallback
+WEB_SERVER_URL = WEB_SERVER_URL_PRIMARY
+
+MAX_BUILD_FILE_SIZE = CONFIG.max_build_file_size  # Maximum build file size for Discord uploads
+
+R2_ACCOUNT_ID = CONFIG.r2_account_id
+R2_ACCESS_KEY_ID = CONFIG.r2_access_key_id
+R2_SECRET_ACCESS_KEY = CONFIG.r2_secret_access_key
+R2_BUCKET_NAME = CONFIG.r2_bucket_name
+R2_PUBLIC_URL = CONFIG.r2_public_url
 
 import tempfile
-TEMP_DIR = Path(tempfile.gettempdir()) / "8bit_bot"
-TEMP_DIR.mkdir(exist_ok=True)
+TEMP_DIR = Path(tempfile.gettempdir(), "8bit_bot")
+TEMP_DIR_STR = os.fspath(TEMP_DIR)  # For os.* calls that take str paths
+if not TEMP_DIR.is_dir():
+    TEMP_DIR.mkdir(parents=True, exist_ok=True)
+
+
+
+def __getattr__(name):
+    """Compute derived settings on first access (PEP 562)"""
+    if name == "R2_ENDPOINT_URL":
+        # Empty when R2 is unconfigured rather than a bogus "https://.r2..." host
+        value = f"https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com" if R2_ACCOUNT_ID else ""
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-if not DISCORD_BOT_TOKEN:
-    raise ValueError("DISCORD_BOT_TOKEN environment variable must be set")
+def validate_runtime_config(cfg: Config) -> None:
+    """Raise ValueError if a setting the bot needs to run is missing"""
+    if not cfg.discord_bot_token:
+        raise ValueError("DISCORD_BOT_TOKEN environment variable must be set")
 
-if not WEB_SERVER_URL_PRIMARY:
-    raise ValueError("WEB_SERVER_URL_PRIMARY environment variable must be set")
+    if not cfg.web_server_url_primary:
+        raise ValueError("WEB_SERVER_URL_PRIMARY environment variable must be set")
 
-if not WEB_SERVER_SECRET:
-    raise ValueError("WEB_SERVER_SECRET environment variable must be set")
+    if not cfg.web_server_secret:
+        raise ValueError("WEB_SERVER_SECRET environment variable must be set")
 
+    raw_size = _load_env().get("MAX_BUILD_FILE_SIZE", "").strip()
+    if raw_size and _parse_size(raw_size) is None:
+        raise ValueError(
+            f"MAX_BUILD_FILE_SIZE must be a positive number of bytes, got {raw_size!r}"
+        )
@@ -1,33 +1,705 @@
 import json
+import math
 import numpy as np
 import os
-from typing import List, Dict, Tuple
+import io
+import mmap
+import re
+from typing import List, Dict, Tuple, Union
 import base64
+import warnings
+from array import array
+from types import MappingProxyType
+
+try:
+    from numba import njit, prange
+    import numba
+except ImportError:  # Optional: only speeds up export_to_gltf
+    njit = None
+    prange = range
+
+try:
+    import orjson
+    _json_loads = orjson.loads  # Raises orjson.JSONDecodeError, a json.JSONDecodeError subclass
+    _json_dumps = orjson.dumps  # Compact UTF-8 bytes
+except ImportError:  # Optional: stdlib json parses the same build files, just slower
+    def _json_loads(raw):
+        return json.loads(str(raw, 'utf-8'))
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+try:
+    from pybase64 import b64encode_as_string as _b64encode_str  # SIMD encoder, returns str directly
+except ImportError:  # Optional: stdlib base64 produces identical output
+    def _b64encode_str(data) -> str:
+        return base64.b64encode(data).decode('ascii')
+
+_FIRST_NON_SPACE = re.compile(rb'\S')
+
+# KHR_mesh_quantization vertex: int16 POSITION padded to 8 bytes, since glTF aligns each
+# vertex element to 4 bytes (12 bytes as float32)
+_QUANTIZED_VERTEX_COMPONENTS = 4
+_QUANTIZED_RANGE = 32767  # Largest int16 magnitude used, symmetric around the translation
+# Largest grid step allowed, as a fraction of a material's smallest block dimension; coarser
+# materials (large spread, tiny blocks) keep float32 positions instead
+_QUANTIZED_TOLERANCE = 1e-3
+
+def _iter_text_blocks(content: str):
+    """Yield the '/'-separated blocks of a text build without building the whole split list"""
+    start = 0
+    while True:
+        end = content.find('/', start)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+# Unit cube corners (scaled by half-size per block) and, per face, its 4 corners
+_CORNER_SIGNS = np.array([
+    [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+    [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],
+], dtype=np.float64)
+_FACE_CORNERS = np.array([
+    [0, 1, 2, 3],  # Back (-Z)
+    [4, 7, 6, 5],  # Front (+Z)
+    [0, 4, 5, 1],  # Bottom (-Y)
+    [2, 6, 7, 3],  # Top (+Y)
+    [0, 3, 7, 4],  # Left (-X)
+    [1, 5, 6, 2],  # Right (+X)
+], dtype=np.int64)
+# Per block: 36 corner indices, two triangles per face. _FACE_CORNERS lists each face
+# clockwise seen from outside, so the triangles reverse it to glTF's counter-clockwise front
+# faces; loaders derive the flat normals from that winding
+_CUBE_TRIANGLES = _FACE_CORNERS[:, [0, 2, 1, 0, 3, 2]].reshape(-1)
+
+def limit_export_threads(n_threads: int):
+    """Cap the threads numba's parallel kernels use in this process (no-op without numba)"""
+    if njit is not None:
+        numba.set_num_threads(max(1, min(n_threads, numba.config.NUMBA_NUM_THREADS)))
+
+def _maybe_njit(**options):
+    """numba.njit(**options) when numba is installed; otherwise leave the function as plain Python"""
+    if njit is None:
+        return lambda fn: fn
+    return njit(**options)
+
+@_maybe_njit(cache=True, inline='always')
+def _rot_mat(rx_deg, ry_deg, rz_deg):
+    """
+    Row-major entries of the Roblox CFrame.Angles rotation (YXZ order) in right-handed
+    GLTF space: R = Ry @ Rx @ Rz with the Z angle negated, expanded to closed form.
+    """
+    sx, cx = math.sin(math.radians(rx_deg)), math.cos(math.radians(rx_deg))
+    sy, cy = math.sin(math.radians(ry_deg)), math.cos(math.radians(ry_deg))
+    # Left- to right-handed: negate the Z angle
+    sz, cz = math.sin(-math.radians(rz_deg)), math.cos(-math.radians(rz_deg))
+    return (
+        cy * cz - sy * sx * sz, cy * sz + sy * sx * cz, -sy * cx,
+        -cx * sz, cx * cz, sx,
+        sy * cz + cy * sx * sz, sy * sz - cy * sx * cz, cy * cx,
+    )
+
+@_maybe_njit(cache=True, fastmath=True, parallel=True)
+def _block_geometry(positions, sizes, rotations, out_verts, out_idx):
+    """
+    Write 8 corner vertices and 36 indices per block into preallocated buffers.
+    positions/sizes/rotations are (N, 3) in Roblox space; the Z flip to GLTF space, the
+    size clamp and the YXZ rotation happen here. Compiled when numba is installed, with
+    blocks spread across threads (each writes only its own rows); without it,
+    _block_geometry_vectorized does the same work with whole-array NumPy ops.
+    """
+    for k in prange(positions.shape[0]):
+        r00, r01, r02, r10, r11, r12, r20, r21, r22 = _rot_mat(rotations[k, 0], rotations[k, 1], rotations[k, 2])
+        
+        hx = min(max(abs(sizes[k, 0]), 0.01), 10000.0) * 0.5
+        hy = min(max(abs(sizes[k, 1]), 0.01), 10000.0) * 0.5
+        hz = min(max(abs(sizes[k, 2]), 0.01), 10000.0) * 0.5
+        px = positions[k, 0]
+        py = positions[k, 1]
+        pz = -positions[k, 2]
+        
+        v = k * 8
+        for c in range(8):
+            lx = _CORNER_SIGNS[c, 0] * hx
+            ly = _CORNER_SIGNS[c, 1] * hy
+            lz = _CORNER_SIGNS[c, 2] * hz
+            out_verts[v + c, 0] = r00 * lx + r01 * ly + r02 * lz + px
+            out_verts[v + c, 1] = r10 * lx + r11 * ly + r12 * lz + py
+            out_verts[v + c, 2] = r20 * lx + r21 * ly + r22 * lz + pz
+        
+        i = k * 36
+        for t in range(36):
+            out_idx[i + t] = v + _CUBE_TRIANGLES[t]
+
+def _rotation_matrices(rotations: np.ndarray) -> np.ndarray:
+    """(N, 3, 3) rotation matrices for (N, 3) degree rotations; vectorized form of _rot_mat"""
+    rx, ry, rz = np.radians(rotations.astype(np.float64)).T
+    sx, cx = np.sin(rx), np.cos(rx)
+    sy, cy = np.sin(ry), np.cos(ry)
+    sz, cz = np.sin(-rz), np.cos(-rz)
+    R = np.empty((len(rotations), 3, 3), dtype=np.float64)
+    R[:, 0, 0] = cy * cz - sy * sx * sz
+    R[:, 0, 1] = cy * sz + sy * sx * cz
+    R[:, 0, 2] = -sy * cx
+    R[:, 1, 0] = -cx * sz
+    R[:, 1, 1] = cx * cz
+    R[:, 1, 2] = sx
+    R[:, 2, 0] = sy * cz + cy * sx * sz
+    R[:, 2, 1] = sy * sz - cy * sx * cz
+    R[:, 2, 2] = cy * cx
+    return R
+
+def _block_geometry_vectorized(positions, sizes, rotations, out_verts, out_idx):
+    """NumPy equivalent of _block_geometry, transforming all blocks' corners in one einsum"""
+    n = len(positions)
+    R = _rotation_matrices(rotations)
+    half = np.clip(np.abs(sizes.astype(np.float64)), 0.01, 10000.0) * 0.5
+    position = positions.astype(np.float64)
+    position[:, 2] = -position[:, 2]
+    
+    # (N, 8, 3) corners: rotate each block's scaled unit cube, then translate
+    corners = np.einsum('nij,nkj->nki', R, _CORNER_SIGNS[None, :, :] * half[:, None, :]) + position[:, None, :]
+    out_verts[:] = corners.reshape(-1, 3)
+    
+    out_idx[:] = (np.arange(n, dtype=np.uint32)[:, None] * 8 + _CUBE_TRIANGLES).reshape(-1)
+
+def _rows_or_default(values: np.ndarray, idx: np.ndarray, default) -> np.ndarray:
+    """values[idx] as float32 rows, with `default` for indices past the end of values"""
+    out = np.empty((len(idx), 3), dtype=np.float32)
+    out[:] = default
+    in_range = idx < len(values)
+    out[in_range] = values[idx[in_range]]
+    return out
+
+def _group_rows(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group the identical rows of a 2-D key array, numbering groups in order of first appearance.
+    Returns (first row of each group, group number of each row, rows per group).
+    """
+    unique_rows, first_row, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    appearance = np.argsort(first_row)
+    rank = np.empty_like(appearance)
+    rank[appearance] = np.arange(len(appearance))
+    group_of_row = rank[inverse.reshape(-1)]
+    return first_row[appearance], group_of_row, np.bincount(group_of_row, minlength=len(unique_rows))
+
+def _scale_color_lists(raw_colors: list) -> Union[List[Tuple[float, float, float]], None]:
+    """
+    Convert [r, g, b, ...] color lists to 0-1 tuples in one numpy pass, scaling each
+    component above 1 down from 0-255 exactly as _parse_color does per block.
+    Returns None unless every entry is a numeric list of the same length (>= 3).
+    """
+    try:
+        values = np.array(raw_colors)
+    except ValueError:
+        return None
+    # Integer/float only: strings, None or nested values make _parse_color raise or take another branch
+    if values.dtype.kind not in 'iuf' or values.ndim != 2 or values.shape[1] < 3:
+        return None
+    values = values[:, :3].astype(np.float64)
+    return list(map(tuple, np.where(values > 1, values / 255.0, values).tolist()))
+
+def _blocks_geometry(positions: np.ndarray, rotations: np.ndarray, sizes: np.ndarray,
+                     order: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Corner vertex rows and triangle indices for the blocks in `order`, written into
+    buffers allocated once. Block k of `order` owns vertex rows [8k, 8k + 8) and index
+    slots [36k, 36k + 36).
+    """
+    idx = np.asarray(order, dtype=np.intp)
+    positions = positions[idx]
+    sizes = _rows_or_default(sizes, idx, (1.0, 1.0, 1.0))
+    rotations = _rows_or_default(rotations, idx, (0.0, 0.0, 0.0))
+
+    n = len(idx)
+    vertices = np.empty((n * 8, 3), dtype=np.float32)
+    indices = np.empty(n * 36, dtype=np.uint32)
+    if njit is not None:
+        _block_geometry(positions, sizes, rotations, vertices, indices)
+    else:
+        _block_geometry_vectorized(positions, sizes, rotations, vertices, indices)
+    return vertices, indices
+
+def export_blocks_to_gltf(output_path: str, positions: np.ndarray, rotations: np.ndarray,
+                         sizes: np.ndarray, colors, transparencies):
+    """
+    Write parsed block arrays (as GLTFRenderer holds them) to output_path as GLTF.
+    Module-level so a worker process only needs these arrays, not the whole renderer.
+    Returns (center, max_size), or None if there are no blocks.
+    """
+    if len(positions) == 0:
+        print("No blocks to export!")
+        return
+
+    print(f"Exporting to GLTF: {output_path}")
+
+    # Calculate center from positions (in left-handed system)
+    min_bounds = positions.min(axis=0)
+    max_bounds = positions.max(axis=0)
+    center = (min_bounds + max_bounds) / 2
+    size = max_bounds - min_bounds
+    max_size = np.max(size)
+
+    # Convert center from left-handed to right-handed (flip Z); center is a fresh array
+    center[2] = -center[2]
+
+    gltf = {
+        "asset": {
+            "version": "2.0",
+            "generator": "Build Renderer"
+        },
+        "scene": 0,
+        "scenes": [{
+            "nodes": []
+        }],
+        "nodes": [],
+        "meshes": [],
+        "materials": [],
+        "accessors": [],
+        "bufferViews": [],
+        "buffers": []
+    }
+
+    # One material per distinct (r, g, b, transparency) row, numbered in first-appearance order
+    n_blocks = len(positions)
+    material_keys = np.empty((n_blocks, 4), dtype=np.float64)
+    material_keys[:, :3] = 0.5
+    material_keys[:, 3] = 0.0
+    n_colors = min(n_blocks, len(colors))
+    n_transparencies = min(n_blocks, len(transparencies))
+    if n_colors:
+        material_keys[:n_colors, :3] = np.asarray(colors[:n_colors], dtype=np.float64)
+    if n_transparencies:
+        material_keys[:n_transparencies, 3] = transparencies[:n_transparencies]
+
+    first_block, block_material, group_sizes = _group_rows(material_keys)
+
+    for material_idx, key in enumerate(material_keys[first_block].tolist()):
+        r, g, b, transparency = key
+        alpha = 1.0 - transparency
+        gltf["materials"].append({
+            "name": f"Material_{material_idx}",
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [r, g, b, alpha],
+                "metallicFactor": 0.1,  # Slight metallic for smoother look
+                "roughnessFactor": 0.4  # Lower roughness for smoother, less rigid appearance
+            },
+            "doubleSided": True  
+        })
+        if alpha < 1.0:
+            gltf["materials"][-1]["alphaMode"] = "BLEND"
+
+    # Block indices per material (ascending within each group), as [start, stop) runs of by_material
+    by_material = np.argsort(block_material, kind='stable')
+    group_stops = np.cumsum(group_sizes)
+    group_starts = group_stops - group_sizes
+
+    # One geometry pass over every block, sliced per material below
+    all_vertices, all_indices = _blocks_geometry(positions, rotations, sizes, by_material)
+    # Rebase indices so each primitive starts at vertex 0
+    all_indices -= np.repeat((group_starts * 8).astype(np.uint32), group_sizes * 36)
+
+    # Each material is quantized onto its own int16 grid centred on its vertex bounds, its
+    # node carrying the inverse transform, so one far-flung material doesn't coarsen the
+    # others. A material whose grid step would exceed _QUANTIZED_TOLERANCE of its smallest
+    # block keeps float32 positions. There is no NORMAL attribute: blocks share their 8
+    # corners between faces, and glTF loaders compute flat normals for primitives without one
+    vertex_starts = group_starts * 8
+    group_min = np.minimum.reduceat(all_vertices, vertex_starts, axis=0)
+    group_max = np.maximum.reduceat(all_vertices, vertex_starts, axis=0)
+    translations = (group_min.astype(np.float64) + group_max) / 2
+    scales = (group_max.astype(np.float64) - group_min) / (2 * _QUANTIZED_RANGE)
+    block_min_size = _rows_or_default(sizes, by_material, (1.0, 1.0, 1.0)).min(axis=1)
+    quantize = scales.max(axis=1) <= _QUANTIZED_TOLERANCE * np.minimum.reduceat(block_min_size, group_starts)
+    scales[scales == 0] = 1.0
+
+    packed = np.zeros((len(all_vertices), _QUANTIZED_VERTEX_COMPONENTS), dtype=np.int16)
+    packed_positions = packed[:, :3]
+    quantized_stride = packed.itemsize * _QUANTIZED_VERTEX_COMPONENTS
+    float_stride = all_vertices.itemsize * 3
+
+    # Every material has blocks, so material m owns node and mesh m, bufferViews 2m
+    # (vertices) and 2m + 1 (indices) and accessors 2m (POSITION) and 2m + 1 (indices);
+    # build the lists locally and attach once
+    vertex_chunks = []
+    vertex_bytes = 0
+    nodes = []
+    meshes = []
+    buffer_views = []
+    accessors = []
+    group_bounds = zip(group_starts.tolist(), group_stops.tolist(), quantize.tolist())
+
+    for material_idx, (start, stop, is_quantized) in enumerate(group_bounds):
+        vertex_start = start * 8
+        vertex_stop = stop * 8
+        node = {"mesh": material_idx}
+        if is_quantized:
+            translation = translations[material_idx]
+            scale = scales[material_idx]
+            node["translation"] = translation.tolist()
+            node["scale"] = scale.tolist()
+            positions_q = packed_positions[vertex_start:vertex_stop]
+            positions_q[:] = np.clip(
+                np.rint((all_vertices[vertex_start:vertex_stop] - translation) / scale),
+                -_QUANTIZED_RANGE, _QUANTIZED_RANGE
+            )
+            chunk = packed[vertex_start:vertex_stop]
+            position_accessor = {
+                "componentType": 5122,  # SHORT
+                "max": positions_q.max(axis=0).tolist(),
+                "min": positions_q.min(axis=0).tolist()
+            }
+            vertex_stride = quantized_stride
+        else:
+            chunk = all_vertices[vertex_start:vertex_stop]
+            position_accessor = {
+                "componentType": 5126,  # FLOAT
+                "max": group_max[material_idx].tolist(),
+                "min": group_min[material_idx].tolist()
+            }
+            vertex_stride = float_stride
+        nodes.append(node)
+
+        vertex_count = vertex_stop - vertex_start
+        index_count = (stop - start) * 36
+        view_idx = 2 * material_idx
+        accessor_idx = 2 * material_idx
+
+        buffer_views.append({
+            "buffer": 0,
+            "byteOffset": vertex_bytes,
+            "byteLength": chunk.nbytes,
+            "byteStride": vertex_stride,
+            "target": 34962  # ARRAY_BUFFER
+        })
+        buffer_views.append({
+            "buffer": 0,
+            "byteOffset": start * 36 * 4,  # Relative to the index block, rebased below
+            "byteLength": index_count * 4,
+            "target": 34963  # ELEMENT_ARRAY_BUFFER
+        })
+        vertex_chunks.append(chunk)
+        vertex_bytes += chunk.nbytes
+
+        accessors.append({
+            "bufferView": view_idx,
+            "byteOffset": 0,
+            "count": vertex_count,
+            "type": "VEC3",
+            **position_accessor
+        })
+        accessors.append({
+            "bufferView": view_idx + 1,
+            "byteOffset": 0,
+            "componentType": 5125,  # UNSIGNED_INT
+            "count": index_count,
+            "type": "SCALAR"
+        })
+
+        meshes.append({
+            "primitives": [{
+                "attributes": {
+                    "POSITION": accessor_idx
+                },
+                "indices": accessor_idx + 1,
+                "material": material_idx
+            }]
+        })
+
+    # One embedded buffer for the whole model: every material's vertices, then every index,
+    # copied straight from the contiguous arrays. 8-byte quantized and 12-byte float
+    # vertices and uint32 indices keep every offset 4-byte aligned. (The model is uploaded
+    # as a single .gltf file, so the buffer stays a data URI rather than an external .bin.)
+    for view in buffer_views[1::2]:
+        view["byteOffset"] += vertex_bytes
+    vertex_chunks.append(all_indices)
+    buffer_data = b''.join(vertex_chunks)
+    gltf["buffers"].append({
+        "uri": f"data:application/octet-stream;base64,{_b64encode_str(buffer_data)}",
+        "byteLength": len(buffer_data)
+    })
+
+    if quantize.any():
+        gltf["extensionsUsed"] = ["KHR_mesh_quantization"]
+        gltf["extensionsRequired"] = ["KHR_mesh_quantization"]
+    gltf["scenes"][0]["nodes"] = list(range(len(nodes)))
+    gltf["nodes"] = nodes
+    gltf["meshes"] = meshes
+    gltf["bufferViews"] = buffer_views
+    gltf["accessors"] = accessors
+    if len(gltf["materials"]) == 0:
+        gltf["materials"].append({
+            "name": "DefaultMaterial",
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [0.5, 0.5, 0.5, 1.0],
+                "metallicFactor": 0.0,
+                "roughnessFactor": 0.7
+            }
+        })
+
+    # Compact, in one write: loaders don't need indentation, and indent=2 forces
+    # the stdlib's pure-Python encoder with a write call per token
+    with open(output_path, 'wb') as f:
+        f.write(_json_dumps(gltf))
+
+    print(f"Exported {len(positions)} blocks to GLTF")
+    return center, max_size
+
+# Fallback color per block type when a build doesn't specify one
+_DEFAULT_COLORS = MappingProxyType({
+    'BuildingBlock': (0.7, 0.7, 0.7),
+    'GoldBlock': (0.9, 0.8, 0.2),
+    'TitaniumBlock': (0.6, 0.6, 0.8),
+    'PlasticBlock': (0.8, 0.8, 0.9),
+    'ConcreteBlock': (0.6, 0.6, 0.6),
+    'MetalBlock': (0.5, 0.5, 0.5),
+    'Piston': (0.7, 0.3, 0.3),
+    'FrontWheel': (0.2, 0.2, 0.2),
+    'BackWheel': (0.2, 0.2, 0.2),
+    'SpikeTrap': (0.8, 0.2, 0.2),
+    'Portal': (0.2, 0.8, 0.8),
+    'Seat': (0.8, 0.2, 0.2),
+    'Glue': (0.9, 0.9, 0.1),
+    'Rope': (0.5, 0.3, 0.1),
+    'Hinge': (0.8, 0.8, 0.2),
+    'TitaniumRod': (0.6, 0.6, 0.8),
+    'CameraDome': (0.2, 0.8, 0.2),
+    'CarSeat': (0.8, 0.2, 0.2),
+    # Wood blocks - light brown wooden boxes (game blocks)
+    'WoodBlock': (0.75, 0.65, 0.50),  # Light brown wood color
+    'Wood': (0.75, 0.65, 0.50),
+    'GameBlock': (0.75, 0.65, 0.50),  # Game blocks are often wood
+})
 
 class GLTFRenderer:
-    def __init__(self, build_file_path: str):
-        self.build_file_path = build_file_path
-        self.blocks = []
-        self.positions = []
-        self.rotations = []
-        self.sizes = []
+    def __init__(self, source: Union[str, bytes, io.BytesIO]):
+        """source is a build file path, or its raw content (bytes/BytesIO) to parse without touching disk"""
+        self.source = source
+        self.build_file_path = source if isinstance(source, str) else "<memory>"
+        self.block_types: List[str] = []  # One type name per block, parallel to the arrays below
+        # (N, 3) float32 arrays, filled in by parse_build_file
+        self.positions = np.empty((0, 3), dtype=np.float32)
+        self.rotations = np.empty((0, 3), dtype=np.float32)
+        self.sizes = np.empty((0, 3), dtype=np.float32)
         self.colors = []
         self.transparencies = []
         
+    def _set_vectors(self, positions: array, rotations: array, sizes: array):
+        """Adopt flat float32 buffers as the (N, 3) position/rotation/size arrays"""
+        self.positions = np.frombuffer(positions, dtype=np.float32).reshape(-1, 3)
+        self.rotations = np.frombuffer(rotations, dtype=np.float32).reshape(-1, 3)
+        self.sizes = np.frombuffer(sizes, dtype=np.float32).reshape(-1, 3)
+    
+    def _parse_text_vectorized(self, content: str) -> bool:
+        """
+        Parse a text build with a single numpy conversion of all numeric fields.
+        Returns False (leaving state untouched) if any block is irregular, so the caller
+        can fall back to the per-field parser with its per-value defaults.
+        """
+        numeric = []
+        block_types = []
+        block_strs = []
+        for block_str in _iter_text_blocks(content):
+            if not block_str.strip():
+                continue
+            fields = block_str.split(':')
+            if len(fields) < 5:
+                continue
+            # position, rotation, color and size must each hold exactly three values
+            head = fields[:4]
+            for field in head:
+                if field.count(',') != 2:
+                    return False
+            numeric.append(','.join(head))
+            block_types.append(fields[4].strip())
+            block_strs.append(block_str)
+        
+        try:
+            with warnings.catch_warnings():
+                # numpy < 2 warns (instead of raising) and returns the values read so far
+                warnings.simplefilter('ignore', DeprecationWarning)
+                values = np.fromstring(','.join(numeric), dtype=np.float64, sep=',')
+        except ValueError:
+            return False
+        if values.size != 12 * len(numeric):
+            return False
+        
+        values = values.reshape(-1, 12)
+        self.positions = values[:, 0:3].astype(np.float32)
+        self.rotations = values[:, 3:6].astype(np.float32)
+        self.colors = [tuple(color) for color in values[:, 6:9].tolist()]
+        self.sizes = np.clip(np.abs(values[:, 9:12]), 0.01, 10000.0).astype(np.float32)
+        self.transparencies = [0.0] * len(block_types)
+        self.block_types = block_types
+        return True
+    
+    def _parse_dict_vectorized(self, data: dict) -> bool:
+        """
+        Parse a dict-of-block-types build with a single numpy conversion of every block's
+        Position/Rotation/Size. The field schema ("x, y, z" strings or [x, y, z] lists) is
+        taken from the first block; returns False (leaving state untouched) if any block
+        deviates from it, so the caller can fall back to the per-field parser.
+        """
+        first = next((
+            block for block_list in data.values() if isinstance(block_list, list)
+            for block in block_list if isinstance(block, dict)
+        ), None)
+        if first is None:
+            return False
+        string_fields = isinstance(first.get('Position', '0, 0, 0'), str)
+        
+        numeric = []
+        block_types = []
+        raw_colors = []
+        raw_transparencies = []
+        for block_type, block_list in data.items():
+            if not isinstance(block_list, list):
+                continue
+            for block in block_list:
+                if not isinstance(block, dict):
+                    continue
+                fields = (
+                    block.get('Position', '0, 0, 0'),
+                    block.get('Rotation', '0, 0, 0'),
+                    block.get('Size', '1, 1, 1'),
+                )
+                if string_fields:
+                    for field in fields:
+                        if not isinstance(field, str) or field.count(',') != 2:
+                            return False
+                    numeric.append(','.join(fields))
+                else:
+                    for field in fields:
+                        if not isinstance(field, list) or len(field) != 3:
+                            return False
+                    numeric.append(fields[0] + fields[1] + fields[2])
+                block_types.append(block_type)
+                raw_colors.append(block.get('Color', None))
+                raw_transparencies.append(block.get('Transparency', 0))
+        
+        try:
+            if string_fields:
+                with warnings.catch_warnings():
+                    # numpy < 2 warns (instead of raising) and returns the values read so far
+                    warnings.simplefilter('ignore', DeprecationWarning)
+                    values = np.fromstring(','.join(numeric), dtype=np.float64, sep=',')
+            else:
+                values = np.array(numeric, dtype=np.float64)
+        except (ValueError, TypeError):
+            return False
+        if values.size != 9 * len(numeric):
+            return False
+        
+        colors = _scale_color_lists(raw_colors)
+        if colors is None:
+            try:
+                colors = [
+                    self._get_default_color(block_type) if color is None else self._parse_color(color)
+                    for block_type, color in zip(block_types, raw_colors)
+                ]
+            except (TypeError, ValueError):
+                return False
+        transparencies = []
+        for transparency in raw_transparencies:
+            try:
+                transparencies.append(float(transparency))
+            except (ValueError, TypeError):
+                transparencies.append(0.0)
+        
+        values = values.reshape(-1, 9)
+        self.positions = values[:, 0:3].astype(np.float32)
+        self.rotations = values[:, 3:6].astype(np.float32)
+        self.sizes = np.clip(np.abs(values[:, 6:9]), 0.01, 10000.0).astype(np.float32)
+        self.colors = colors
+        self.transparencies = transparencies
+        self.block_types = block_types
+        return True
+    
+    def _parse_list_of_lists_vectorized(self, data: list) -> bool:
+        """
+        Parse a list-of-lists build with a single numpy conversion of every block's
+        position/rotation/size lists. Returns False (leaving state untouched) if any block
+        is short or has a non-[x, y, z] vector, so the caller can fall back to the per-block parser.
+        """
+        numeric = []
+        for block_data in data:
+            if not isinstance(block_data, list) or len(block_data) < 7:
+                return False
+            position, rotation, size = block_data[1], block_data[2], block_data[4]
+            if not (isinstance(position, list) and isinstance(rotation, list) and isinstance(size, list)):
+                return False
+            if not len(position) == len(rotation) == len(size) == 3:
+                return False
+            numeric.append(position + rotation + size)
+        
+        try:
+            values = np.array(numeric, dtype=np.float64)
+        except (ValueError, TypeError):
+            return False
+        
+        block_types = [str(block_data[0]) for block_data in data]
+        colors = _scale_color_lists([block_data[6] for block_data in data])
+        if colors is None:
+            colors = []
+            try:
+                for block_type, block_data in zip(block_types, data):
+                    color = block_data[6]
+                    if isinstance(color, list) and len(color) >= 3:
+                        colors.append(tuple(float(c) / 255.0 if c > 1 else float(c) for c in color[:3]))
+                    elif isinstance(color, str):
+                        colors.append(self._parse_color(color))
+                    else:
+                        colors.append(self._get_default_color(block_type))
+            except (ValueError, TypeError):
+                return False
+        
+        self.positions = values[:, 0:3].astype(np.float32)
+        self.rotations = values[:, 3:6].astype(np.float32)
+        self.sizes = np.clip(np.abs(values[:, 6:9]), 0.01, 10000.0).astype(np.float32)
+        self.colors = colors
+        self.transparencies = [0.0] * len(data)
+        self.block_types = block_types
+        return True
+    
     def parse_build_file(self):
         """Parse the build file"""
         print(f"Parsing build file: {self.build_file_path}")
         
-        with open(self.build_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if not isinstance(self.source, str):
+            data = self.source.getvalue() if isinstance(self.source, io.BytesIO) else self.source
+            self._parse_raw(bytes(data))
+            return
+        
+        with open(self.source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:  # mmap rejects empty files
+                self._parse_raw(b'')
+                return
+            # Map the file read-only instead of reading a copy; JSON decodes straight from the page cache
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+                self._parse_raw(raw)
+    
+    def _parse_raw(self, raw: Union[bytes, mmap.mmap]):
+        """Parse UTF-8 build content held in bytes or a read-only mmap"""
+        # Flat x, y, z runs per block; turned into (N, 3) arrays once parsing is done
+        positions = array('f')
+        rotations = array('f')
+        sizes = array('f')
         
         # Check if it's Format 1: Custom text format (kurma.Build)
-        if '/' in content and ':' in content and not content.strip().startswith('[') and not content.strip().startswith('{'):
+        first = _FIRST_NON_SPACE.search(raw)
+        first_char = first.group() if first else b''
+        if raw.find(b'/') != -1 and raw.find(b':') != -1 and first_char not in (b'[', b'{'):
             print("Detected custom text format (kurma.Build style)")
+            content = str(raw, 'utf-8')
+            if self._parse_text_vectorized(content):
+                print(f"Parsed {len(self.block_types)} blocks from custom text format")
+                return
+            
             block_count = 0
-            blocks = content.split('/')
             
-            for block_str in blocks:
+            for block_str in _iter_text_blocks(content):
                 if not block_str.strip():
                     continue
                 
@@ -43,31 +715,31 @@ class GLTFRenderer:
                         try:
                             position = [float(x.strip()) for x in position_str.split(',')]
                             if len(position) == 3:
-                                self.positions.append(np.array(position))
+                                positions.extend(position)
                             else:
-                                self.positions.append(np.array([0.0, 0.0, 0.0]))
+                                positions.extend((0.0, 0.0, 0.0))
                         except:
-                            self.positions.append(np.array([0.0, 0.0, 0.0]))
+                            positions.extend((0.0, 0.0, 0.0))
                         
                         try:
                             rotation = [float(x.strip()) for x in rotation_str.split(',')]
                             if len(rotation) == 3:
-                                self.rotations.append(np.array(rotation))
+                                rotations.extend(rotation)
                             else:
-                                self.rotations.append(np.array([0.0, 0.0, 0.0]))
+                                rotations.extend((0.0, 0.0, 0.0))
                         except:
-                            self.rotations.append(np.array([0.0, 0.0, 0.0]))
+                            rotations.extend((0.0, 0.0, 0.0))
                         
                         try:
                             size = [float(x.strip()) for x in size_str.split(',')]
                             if len(size) == 3:
                                 size = [abs(float(s)) for s in size]
                                 size = [max(0.01, min(10000.0, s)) for s in size]
-                                self.sizes.append(np.array(size))
+                                sizes.extend(size)
                             else:
-                                self.sizes.append(np.array([1.0, 1.0, 1.0]))
+                                sizes.extend((1.0, 1.0, 1.0))
                         except:
-                            self.sizes.append(np.array([1.0, 1.0, 1.0]))
+                            sizes.extend((1.0, 1.0, 1.0))
                         
                         try:
                             color = [float(x.strip()) for x in color_str.split(',')]
@@ -80,17 +752,19 @@ class GLTFRenderer:
                         
                         self.colors.append(color)
                         self.transparencies.append(0.0)
-                        self.blocks.append({'type': block_type, 'data': block_str})
+                        self.block_types.append(block_type)
                         block_count += 1
                 except Exception as e:
                     print(f"Warning: Error parsing block in text format: {e}")
                     continue
             
+            self._set_vectors(positions, rotations, sizes)
             print(f"Parsed {block_count} blocks from custom text format")
             return
         
         try:
-            data = json.loads(content)
+            with memoryview(raw) as view:
+                data = _json_loads(view)
         except json.JSONDecodeError as e:
             print(f"JSON parsing error: {e}")
             return
@@ -104,6 +778,10 @@ class GLTFRenderer:
             elif len(data) > 0 and isinstance(data[0], list):
                 # Format 2: List of lists
                 print("Detected list-of-lists format (tank.build style)")
+                if self._parse_list_of_lists_vectorized(data):
+                    print(f"Parsed {len(self.block_types)} blocks from list-of-lists format")
+                    return
+                
                 block_count = 0
                 for block_data in data:
                     if isinstance(block_data, list) and len(block_data) >= 7:
@@ -116,21 +794,21 @@ class GLTFRenderer:
                             color = block_data[6] if len(block_data) > 6 else [128, 128, 128]
                             
                             if len(position) == 3:
-                                self.positions.append(np.array([float(p) for p in position]))
+                                positions.extend([float(p) for p in position])
                             else:
-                                self.positions.append(np.array([0.0, 0.0, 0.0]))
+                                positions.extend((0.0, 0.0, 0.0))
                             
                             if len(rotation) == 3:
-                                self.rotations.append(np.array([float(r) for r in rotation]))
+                                rotations.extend([float(r) for r in rotation])
                             else:
-                                self.rotations.append(np.array([0.0, 0.0, 0.0]))
+                                rotations.extend((0.0, 0.0, 0.0))
                             
                             if len(size) == 3:
                                 size = [abs(float(s)) for s in size]
                                 size = [max(0.01, min(10000.0, s)) for s in size]
-                                self.sizes.append(np.array(size))
+                                sizes.extend(size)
                             else:
-                                self.sizes.append(np.array([1.0, 1.0, 1.0]))
+                                sizes.extend((1.0, 1.0, 1.0))
                             
                             if isinstance(color, list) and len(color) >= 3:
                                 color = tuple(float(c) / 255.0 if c > 1 else float(c) for c in color[:3])
@@ -139,19 +817,20 @@ class GLTFRenderer:
                             
                             self.colors.append(color)
                             self.transparencies.append(0.0) 
-                            self.blocks.append({'type': block_type, 'data': block_data})
+                            self.block_types.append(block_type)
                             block_count += 1
                         except Exception as e:
                             print(f"Warning: Error parsing block in list format: {e}, using defaults")
                             # Still add defaults to keep arrays in sync
-                            self.positions.append(np.array([0.0, 0.0, 0.0]))
-                            self.rotations.append(np.array([0.0, 0.0, 0.0]))
-                            self.sizes.append(np.array([1.0, 1.0, 1.0]))
+                            positions.extend((0.0, 0.0, 0.0))
+                            rotations.extend((0.0, 0.0, 0.0))
+                            sizes.extend((1.0, 1.0, 1.0))
                             self.colors.append((0.5, 0.5, 0.5))
                             self.transparencies.append(0.0)
-                            self.blocks.append({'type': 'UnknownBlock', 'data': block_data})
+                            self.block_types.append('UnknownBlock')
                             block_count += 1
                 
+                self._set_vectors(positions, rotations, sizes)
                 print(f"Parsed {block_count} blocks from list-of-lists format")
                 return
             
@@ -164,6 +843,10 @@ class GLTFRenderer:
                 return
         
         print("Detected dict-of-block-types format (7R9R42YYMGNT.Build style)")
+        if self._parse_dict_vectorized(data):
+            print(f"Parsed {len(self.block_types)} blocks")
+            return
+        
         block_count = 0
         for block_type, block_list in data.items():
             if isinstance(block_list, list):
@@ -189,7 +872,7 @@ class GLTFRenderer:
                             else:
                                 pos = [0.0, 0.0, 0.0]
                             
-                            self.positions.append(np.array(pos))
+                            positions.extend(pos)
                             
                             # Parse rotation - handle both string and list formats
                             rotation_str = block.get('Rotation', '0, 0, 0')
@@ -210,7 +893,7 @@ class GLTFRenderer:
                             else:
                                 rot = [0.0, 0.0, 0.0]
                             
-                            self.rotations.append(np.array(rot))
+                            rotations.extend(rot)
                             
                             # Parse size - handle both string and list formats
                             size_str = block.get('Size', '1, 1, 1')
@@ -238,7 +921,7 @@ class GLTFRenderer:
                             else:
                                 size = [1.0, 1.0, 1.0]
                             
-                            self.sizes.append(np.array(size))
+                            sizes.extend(size)
                             
                             # Parse color
                             color = block.get('Color', None)
@@ -256,29 +939,21 @@ class GLTFRenderer:
                                 transparency = 0.0
                             self.transparencies.append(transparency)
                             
-                            self.blocks.append({
-                                'type': block_type,
-                                'position': pos,
-                                'rotation': rot,
-                                'size': size
-                            })
+                            self.block_types.append(block_type)
                             block_count += 1
                         except Exception as e:
                             print(f"Warning: Error parsing block {block_type}: {e}, using defaults")
                             # Still add defaults to keep arrays in sync
-                            self.positions.append(np.array([0.0, 0.0, 0.0]))
-                            self.rotations.append(np.array([0.0, 0.0, 0.0]))
-                            self.sizes.append(np.array([1.0, 1.0, 1.0]))
+                            positions.extend((0.0, 0.0, 0.0))
+                            rotations.extend((0.0, 0.0, 0.0))
+                            sizes.extend((1.0, 1.0, 1.0))
                             self.colors.append(self._get_default_color(block_type))
                             self.transparencies.append(0.0)
-                            self.blocks.append({
-                                'type': block_type,
-                                'position': [0.0, 0.0, 0.0],
-                                'rotation': [0.0, 0.0, 0.0],
-                                'size': [1.0, 1.0, 1.0]
-                            })
+                            self.block_types.append(block_type)
                             block_count += 1
         
+        self._set_vectors(positions, rotations, sizes)
+        
         if len(self.positions) == 0:
             print("Warning: No blocks with valid positions found!")
             return
@@ -290,7 +965,7 @@ class GLTFRenderer:
             'sizes': len(self.sizes),
             'colors': len(self.colors),
             'transparencies': len(self.transparencies),
-            'blocks': len(self.blocks)
+            'block_types': len(self.block_types)
         }
         
         if len(set(array_lengths.values())) > 1:
@@ -304,38 +979,14 @@ class GLTFRenderer:
                 self.sizes = self.sizes[:min_len]
                 self.colors = self.colors[:min_len]
                 self.transparencies = self.transparencies[:min_len]
-                self.blocks = self.blocks[:min_len]
+                self.block_types = self.block_types[:min_len]
                 print(f"Truncated all arrays to length {min_len}")
         
         print(f"Parsed {block_count} blocks")
         print(f"Array lengths: {array_lengths}")
     
     def _get_default_color(self, block_type: str) -> Tuple[float, float, float]:
-        color_map = {
-            'BuildingBlock': (0.7, 0.7, 0.7),
-            'GoldBlock': (0.9, 0.8, 0.2),
-            'TitaniumBlock': (0.6, 0.6, 0.8),
-            'PlasticBlock': (0.8, 0.8, 0.9),
-            'ConcreteBlock': (0.6, 0.6, 0.6),
-            'MetalBlock': (0.5, 0.5, 0.5),
-            'Piston': (0.7, 0.3, 0.3),
-            'FrontWheel': (0.2, 0.2, 0.2),
-            'BackWheel': (0.2, 0.2, 0.2),
-            'SpikeTrap': (0.8, 0.2, 0.2),
-            'Portal': (0.2, 0.8, 0.8),
-            'Seat': (0.8, 0.2, 0.2),
-            'Glue': (0.9, 0.9, 0.1),
-            'Rope': (0.5, 0.3, 0.1),
-            'Hinge': (0.8, 0.8, 0.2),
-            'TitaniumRod': (0.6, 0.6, 0.8),
-            'CameraDome': (0.2, 0.8, 0.2),
-            'CarSeat': (0.8, 0.2, 0.2),
-            # Wood blocks - light brown wooden boxes (game blocks)
-            'WoodBlock': (0.75, 0.65, 0.50),  # Light brown wood color
-            'Wood': (0.75, 0.65, 0.50),
-            'GameBlock': (0.75, 0.65, 0.50),  # Game blocks are often wood
-        }
-        return color_map.get(block_type, (0.5, 0.5, 0.5))
+        return _DEFAULT_COLORS.get(block_type, (0.5, 0.5, 0.5))
     
     def _parse_color(self, color_value) -> Tuple[float, float, float]:
         if color_value is None:
@@ -355,50 +1006,19 @@ class GLTFRenderer:
         
         return (0.5, 0.5, 0.5)
     
-    def _build_roblox_rotation_matrix(self, rotation_deg: np.ndarray) -> np.ndarray:
+    def _type_volumes(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
         """
-        Build rotation matrix that exactly matches Roblox CFrame.angles(rx, ry, rz).
-        
-        Roblox uses YXZ rotation order in a left-handed coordinate system.
-        To convert to right-handed (GLTF), we:
-        1. Negate the Z rotation angle (flip handedness)
-        2. Apply rotations in YXZ order for right-handed system
+        Block types in first-appearance order, each block's index into them, and each
+        block's x*y*z volume (1.0 for blocks without a size)
         """
-        rx, ry, rz = np.radians(rotation_deg)
-        
-        # Convert from left-handed to right-handed by negating Z rotation
-        rz_rh = -rz
-        
-        # Build rotation matrices for right-handed Y-up coordinate system
-        cosx, sinx = np.cos(rx), np.sin(rx)
-        cosy, siny = np.cos(ry), np.sin(ry)
-        cosz, sinz = np.cos(rz_rh), np.sin(rz_rh)
-        
-        # Y rotation (yaw) - right-handed
-        Ry = np.array([
-            [cosy, 0, -siny],
-            [0, 1, 0],
-            [siny, 0, cosy]
-        ], dtype=np.float32)
-        
-        # X rotation (pitch) - right-handed
-        Rx = np.array([
-            [1, 0, 0],
-            [0, cosx, sinx],
-            [0, -sinx, cosx]
-        ], dtype=np.float32)
-        
-        # Z rotation (roll) - right-handed
-        Rz = np.array([
-            [cosz, sinz, 0],
-            [-sinz, cosz, 0],
-            [0, 0, 1]
-        ], dtype=np.float32)
-        
-        # Apply in YXZ order: Ry * Rx * Rz
-        R = Ry @ Rx @ Rz
-        
-        return R
+        type_index = {}
+        block_type_idx = np.fromiter(
+            (type_index.setdefault(block_type, len(type_index)) for block_type in self.block_types),
+            dtype=np.intp, count=len(self.block_types),
+        )
+        sizes = _rows_or_default(self.sizes, np.arange(len(self.block_types)), (1.0, 1.0, 1.0))
+        volumes = sizes.astype(np.float64).prod(axis=1)
+        return list(type_index), block_type_idx, volumes
     
     def compute_scaled_counts(self) -> Dict[str, int]:
         """
@@ -406,38 +1026,9 @@ class GLTFRenderer:
         Similar to computeScaledCounts in build.js
         Returns: { block_type: scaled_count }
         """
-        counts = {}
-        
-        # Group blocks by type
-        block_groups = {}
-        for i, block in enumerate(self.blocks):
-            block_type = block.get('type', 'UnknownBlock')
-            if block_type not in block_groups:
-                block_groups[block_type] = []
-            block_groups[block_type].append(i)
-        
-        # Calculate scaled counts for each block type
-        for block_type, indices in block_groups.items():
-            total = 0
-            for idx in indices:
-                if idx < len(self.sizes):
-                    size = self.sizes[idx]
-                    if isinstance(size, np.ndarray):
-                        size = size.tolist()
-                    elif not isinstance(size, (list, tuple)):
-                        size = [1.0, 1.0, 1.0]
-                    
-                    x, y, z = float(size[0]) if len(size) > 0 else 1.0, \
-                             float(size[1]) if len(size) > 1 else 1.0, \
-                             float(size[2]) if len(size) > 2 else 1.0
-                    volume = x * y * z
-                    total += int(np.ceil(volume / 8))
-                else:
-                    total += 1  # Default size [1,1,1] = 1 scaled count
-            
-            counts[block_type] = total
-        
-        return counts
+        block_types, block_type_idx, volumes = self._type_volumes()
+        scaled = np.bincount(block_type_idx, weights=np.ceil(volumes / 8), minlength=len(block_types))
+        return {block_type: int(scaled[i]) for i, block_type in enumerate(block_types)}
     
     def summarise_blocks(self) -> Dict[str, Dict[str, float]]:
         """
@@ -445,611 +1036,31 @@ class GLTFRenderer:
         Similar to summariseBlocks in build.js
         Returns: { block_type: { count, rawVolume, scaledCount } }
         """
-        summary = {}
-        
-        # Group blocks by type
-        block_groups = {}
-        for i, block in enumerate(self.blocks):
-            block_type = block.get('type', 'UnknownBlock')
-            if block_type not in block_groups:
-                block_groups[block_type] = []
-            block_groups[block_type].append(i)
+        block_types, block_type_idx, volumes = self._type_volumes()
+        n_types = len(block_types)
+        counts = np.bincount(block_type_idx, minlength=n_types)
+        raw_volumes = np.bincount(block_type_idx, weights=volumes, minlength=n_types)
+        scaled = np.bincount(block_type_idx, weights=np.ceil(volumes / 8), minlength=n_types)
         
-        # Calculate summary for each block type
-        for block_type, indices in block_groups.items():
-            count = 0
-            raw_volume = 0.0
-            scaled = 0
-            
-            for idx in indices:
-                count += 1
-                
-                if idx < len(self.sizes):
-                    size = self.sizes[idx]
-                    if isinstance(size, np.ndarray):
-                        size = size.tolist()
-                    elif not isinstance(size, (list, tuple)):
-                        size = [1.0, 1.0, 1.0]
-                    
-                    x, y, z = float(size[0]) if len(size) > 0 else 1.0, \
-                             float(size[1]) if len(size) > 1 else 1.0, \
-                             float(size[2]) if len(size) > 2 else 1.0
-                    vol = x * y * z
-                    raw_volume += vol
-                    scaled += int(np.ceil(vol / 8))
-                else:
-                    # Default size [1,1,1]
-                    raw_volume += 1.0
-                    scaled += 1
-            
-            summary[block_type] = {
-                'count': count,
-                'rawVolume': raw_volume,
-                'scaledCount': scaled
+        return {
+            block_type: {
+                'count': int(counts[i]),
+                'rawVolume': float(raw_volumes[i]),
+                'scaledCount': int(scaled[i])
             }
-        
-        return summary
-    
-    def export_to_gltf(self, output_path: str):
-        if len(self.positions) == 0:
-            print("No blocks to export!")
-            return
-        
-        print(f"Exporting to GLTF: {output_path}")
-        
-        # Calculate center from positions (in left-handed system)
-        positions_array = np.array(self.positions)
-        min_bounds = positions_array.min(axis=0)
-        max_bounds = positions_array.max(axis=0)
-        center_lh = (min_bounds + max_bounds) / 2
-        size = max_bounds - min_bounds
-        max_size = np.max(size)
-        
-        # Convert center from left-handed to right-handed (flip Z)
-        center = center_lh.copy()
-        center[2] = -center[2]
-        
-        gltf = {
-            "asset": {
-                "version": "2.0",
-                "generator": "Build Renderer"
-            },
-            "scene": 0,
-            "scenes": [{
-                "nodes": [0]
-            }],
-            "nodes": [{
-                "mesh": 0
-            }],
-            "meshes": [{
-                "primitives": []
-            }],
-            "materials": [],
-            "accessors": [],
-            "bufferViews": [],
-            "buffers": []
+            for i, block_type in enumerate(block_types)
         }
-        
-        material_map = {}
-        material_groups = {}  
-        
-        for i in range(len(self.positions)):
-            color = self.colors[i] if i < len(self.colors) else (0.5, 0.5, 0.5)
-            transparency = self.transparencies[i] if i < len(self.transparencies) else 0
-            material_key = (float(color[0]), float(color[1]), float(color[2]), float(transparency))
-            
-            if material_key not in material_map:
-                material_idx = len(gltf["materials"])
-                material_map[material_key] = material_idx
-                material_groups[material_idx] = []
-                
-                alpha = 1.0 - transparency
-                gltf["materials"].append({
-                    "name": f"Material_{material_idx}",
-                    "pbrMetallicRoughness": {
-                        "baseColorFactor": [color[0], color[1], color[2], alpha],
-                        "metallicFactor": 0.1,  # Slight metallic for smoother look
-                        "roughnessFactor": 0.4  # Lower roughness for smoother, less rigid appearance
-                    },
-                    "doubleSided": True  
-                })
-                if alpha < 1.0:
-                    gltf["materials"][-1]["alphaMode"] = "BLEND"
-            
-            material_groups[material_map[material_key]].append(i)
-        
-        primitives = []
-        buffer_offset = 0
-        
-        for material_idx in sorted(material_groups.keys()):
-            block_indices = material_groups[material_idx]
-            group_vertices = []
-            group_normals = []
-            group_indices = []
-            
-            for block_idx in block_indices:
-                # Validate index bounds
-                if block_idx >= len(self.positions):
-                    print(f"WARNING: block_idx {block_idx} >= len(positions) {len(self.positions)}, skipping")
-                    continue
-                if block_idx >= len(self.sizes):
-                    print(f"WARNING: block_idx {block_idx} >= len(sizes) {len(self.sizes)}, using default")
-                if block_idx >= len(self.rotations):
-                    print(f"WARNING: block_idx {block_idx} >= len(rotations) {len(self.rotations)}, using default")
-                
-                # Get position and rotation from Roblox
-                position_roblox = self.positions[block_idx].copy()
-                size = self.sizes[block_idx] if block_idx < len(self.sizes) else np.array([1.0, 1.0, 1.0])
-                rotation = self.rotations[block_idx] if block_idx < len(self.rotations) else np.array([0, 0, 0])
-                
-                if not isinstance(size, np.ndarray):
-                    size = np.array(size)
-                if size.shape[0] != 3:
-                    size = np.array([1.0, 1.0, 1.0])
-                
-                size = np.abs(size)
-                size = np.clip(size, 0.01, 10000.0)
-                
-                # Convert position from Roblox (left-handed) to GLTF (right-handed)
-                # Roblox: +X right, +Y up, +Z forward (left-handed)
-                # GLTF: +X right, +Y up, +Z backward (right-handed)
-                position = position_roblox.copy()
-                position[2] = -position[2]  # Flip Z axis
-                
-                # Build cube corners in local space (before rotation)
-                half_size = size / 2.0
-                corners_local = np.array([
-                    [-half_size[0], -half_size[1], -half_size[2]],  # 0
-                    [ half_size[0], -half_size[1], -half_size[2]],  # 1
-                    [ half_size[0],  half_size[1], -half_size[2]],  # 2
-                    [-half_size[0],  half_size[1], -half_size[2]],  # 3
-                    [-half_size[0], -half_size[1],  half_size[2]],  # 4
-                    [ half_size[0], -half_size[1],  half_size[2]],  # 5
-                    [ half_size[0],  half_size[1],  half_size[2]],  # 6
-                    [-half_size[0],  half_size[1],  half_size[2]],  # 7
-                ], dtype=np.float32)
-                
-                # Get rotation matrix that matches Roblox CFrame.angles
-                R = self._build_roblox_rotation_matrix(rotation)
-                
-                # Apply rotation and translation to corners
-                corners = (corners_local @ R.T) + position
-
-                # Face definitions with normals (4 vertices per face, 6 faces = 24 vertices)
-                face_defs = [
-                    ([0, 1, 2, 3], [0, 0, -1]),   # Back (-Z)
-                    ([4, 7, 6, 5], [0, 0, 1]),    # Front (+Z)
-                    ([0, 4, 5, 1], [0, -1, 0]),   # Bottom (-Y)
-                    ([2, 6, 7, 3], [0, 1, 0]),    # Top (+Y)
-                    ([0, 3, 7, 4], [-1, 0, 0]),   # Left (-X)
-                    ([1, 5, 6, 2], [1, 0, 0]),    # Right (+X)
-                ]
-                
-                base_vertex_idx = len(group_vertices)
-                
-                # Get rotation matrix for transforming normals
-                R = self._build_roblox_rotation_matrix(rotation)
-                
-                for corner_indices, normal_base in face_defs:
-                    # Transform normal by rotation matrix
-                    normal_transformed = (R @ np.array(normal_base)).tolist()
-
-                    for corner_idx in corner_indices:
-                        group_vertices.append(corners[corner_idx].tolist())
-                        group_normals.append(normal_transformed)
-                
-                for face_idx in range(6):
-                    v0 = base_vertex_idx + face_idx * 4
-                    group_indices.extend([
-                        v0, v0 + 1, v0 + 2,  # First triangle
-                        v0, v0 + 2, v0 + 3   # Second triangle
-                    ])
-            
-            if not group_vertices:
-                continue
-            
-            vertices_array = np.array(group_vertices, dtype=np.float32)
-            normals_array = np.array(group_normals, dtype=np.float32)
-            indices_array = np.array(group_indices, dtype=np.uint32)
-            vertices_bytes = vertices_array.tobytes()
-            normals_bytes = normals_array.tobytes()
-            indices_bytes = indices_array.tobytes()
-            
-            def pad_buffer(buf):
-                padding = (4 - (len(buf) % 4)) % 4
-                return buf + b'\x00' * padding
-            
-            vertices_bytes = pad_buffer(vertices_bytes)
-            normals_bytes = pad_buffer(normals_bytes)
-            indices_bytes = pad_buffer(indices_bytes)
-            buffer_data = vertices_bytes + normals_bytes + indices_bytes
-            buffer_base64 = base64.b64encode(buffer_data).decode('ascii')
-            
-            buffer_idx = len(gltf["buffers"])
-            gltf["buffers"].append({
-                "uri": f"data:application/octet-stream;base64,{buffer_base64}",
-                "byteLength": len(buffer_data)
-            })
-            
-            offset = 0
-            vertices_view_idx = len(gltf["bufferViews"])
-            gltf["bufferViews"].append({
-                "buffer": buffer_idx,
-                "byteOffset": offset,
-                "byteLength": len(vertices_bytes),
-                "target": 34962  # ARRAY_BUFFER
-            })
-            offset += len(vertices_bytes)
-            
-            normals_view_idx = len(gltf["bufferViews"])
-            gltf["bufferViews"].append({
-                "buffer": buffer_idx,
-                "byteOffset": offset,
-                "byteLength": len(normals_bytes),
-                "target": 34962  # ARRAY_BUFFER
-            })
-            offset += len(normals_bytes)
-            
-            indices_view_idx = len(gltf["bufferViews"])
-            gltf["bufferViews"].append({
-                "buffer": buffer_idx,
-                "byteOffset": offset,
-                "byteLength": len(indices_bytes),
-                "target": 34963  # ELEMENT_ARRAY_BUFFER
-            })
-            
-            vertices_accessor_idx = len(gltf["accessors"])
-            gltf["accessors"].append({
-                "bufferView": vertices_view_idx,
-                "byteOffset": 0,
-                "componentType": 5126,  # FLOAT
-                "count": len(vertices_array),
-                "type": "VEC3",
-                "max": vertices_array.max(axis=0).tolist(),
-                "min": vertices_array.min(axis=0).tolist()
-            })
-            
-            normals_accessor_idx = len(gltf["accessors"])
-            gltf["accessors"].append({
-                "bufferView": normals_view_idx,
-                "byteOffset": 0,
-                "componentType": 5126,  # FLOAT
-                "count": len(normals_array),
-                "type": "VEC3"
-            })
-            
-            indices_accessor_idx = len(gltf["accessors"])
-            gltf["accessors"].append({
-                "bufferView": indices_view_idx,
-                "byteOffset": 0,
-                "componentType": 5125,  # UNSIGNED_INT
-                "count": len(indices_array),
-                "type": "SCALAR"
-            })
-            
-            primitives.append({
-                "attributes": {
-                    "POSITION": vertices_accessor_idx,
-                    "NORMAL": normals_accessor_idx
-                },
-                "indices": indices_accessor_idx,
-                "material": material_idx
-            })
-        
-        gltf["meshes"][0]["primitives"] = primitives
-        if len(gltf["materials"]) == 0:
-            gltf["materials"].append({
-                "name": "DefaultMaterial",
-                "pbrMetallicRoughness": {
-                    "baseColorFactor": [0.5, 0.5, 0.5, 1.0],
-                    "metallicFactor": 0.0,
-                    "roughnessFactor": 0.7
-                }
-            })
-        
-        with open(output_path, 'w') as f:
-            json.dump(gltf, f, indent=2)
-        
-        print(f"Exported {len(self.positions)} blocks to GLTF")
-        return center, max_size
     
-    def create_viewer_html(self, gltf_filename: str, center: np.ndarray, max_size: float, port: int = 8000):
-        cx, cy, cz = float(center[0]), float(center[1]), float(center[2])
-        distance = max_size * 2
-        
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>3D Build Viewer</title>
-    <style>
-        body {{
-            margin: 0;
-            padding: 0;
-            overflow: hidden;
-            background: #1a1a1a;
-            font-family: Arial, sans-serif;
-        }}
-        #container {{
-            width: 100vw;
-            height: 100vh;
-        }}
-        #info {{
-            position: absolute;
-            top: 10px;
-            left: 10px;
-            color: white;
-            background: rgba(0, 0, 0, 0.7);
-            padding: 10px;
-            border-radius: 5px;
-            z-index: 100;
-        }}
-        #controls {{
-            position: absolute;
-            bottom: 10px;
-            left: 10px;
-            color: white;
-            background: rgba(0, 0, 0, 0.7);
-            padding: 10px;
-            border-radius: 5px;
-            z-index: 100;
-        }}
-    </style>
-    <script type="importmap">
-        {{
-            "imports": {{
-                "three": "https://cdn.jsdelivr.net/npm/three@0.160.0/build/three.module.js",
-                "three/addons/": "https://cdn.jsdelivr.net/npm/three@0.160.0/examples/jsm/"
-            }}
-        }}
-    </script>
-</head>
-<body>
-    <div id="container"></div>
-    <div id="info">
-        <h3>3D Build Viewer</h3>
-        <p>Drag to rotate | Scroll to zoom | Right-click to pan</p>
-    </div>
-    <div id="controls">
-        <button onclick="resetCamera()">Reset Camera</button>
-        <button onclick="toggleWireframe()">Toggle Wireframe</button>
-        <button onclick="takeAllSnapshots()">Take Snapshots</button>
-    </div>
+    def export_arrays(self) -> tuple:
+        """
+        (positions, rotations, sizes, colors, transparencies) for export_blocks_to_gltf,
+        with colors and transparencies as compact float64 arrays for pickling
+        """
+        return (
+            self.positions, self.rotations, self.sizes,
+            np.asarray(self.colors, dtype=np.float64).reshape(-1, 3),
+            np.asarray(self.transparencies, dtype=np.float64),
+        )
     
-    <script type="module">
-        import * as THREE from 'three';
-        import {{ GLTFLoader }} from 'three/addons/loaders/GLTFLoader.js';
-        import {{ OrbitControls }} from 'three/addons/controls/OrbitControls.js';
-        
-        // Initialize viewer
-        let scene, camera, renderer, controls, model;
-        let wireframe = false;
-        
-        // Scene setup
-        scene = new THREE.Scene();
-        scene.background = new THREE.Color(0x1a1a1a);
-        
-        // Camera setup - position above and in front of the model
-        const distance = {distance};
-        camera = new THREE.PerspectiveCamera(75, window.innerWidth / window.innerHeight, 0.1, distance * 10);
-        // Position camera at an angle above and in front of the model (further away)
-        const cameraDistance = distance * 2.5;  // Increased initial distance
-        camera.position.set({cx} + cameraDistance * 0.7, {cy} + cameraDistance * 0.5, {cz} + cameraDistance * 0.7);
-        camera.lookAt({cx}, {cy}, {cz});
-        
-        // Renderer setup with high quality settings
-        renderer = new THREE.WebGLRenderer({{
-            antialias: true,
-            powerPreference: "high-performance",
-            stencil: false,
-            depth: true
-        }});
-        renderer.setPixelRatio(Math.min(window.devicePixelRatio, 2)); // High DPI support, capped at 2x for performance
-        renderer.setSize(window.innerWidth, window.innerHeight);
-        renderer.shadowMap.enabled = true;
-        renderer.shadowMap.type = THREE.PCFSoftShadowMap; // Soft shadows
-        renderer.toneMapping = THREE.ACESFilmicToneMapping;
-        renderer.toneMappingExposure = 1.0;
-        renderer.outputColorSpace = THREE.SRGBColorSpace;
-        renderer.physicallyCorrectLights = true;
-        document.getElementById('container').appendChild(renderer.domElement);
-        
-        // Controls with improved zoom behavior
-        controls = new OrbitControls(camera, renderer.domElement);
-        controls.enableDamping = true;
-        controls.dampingFactor = 0.05;
-        controls.target.set({cx}, {cy}, {cz});
-        
-        // Regular zoom behavior
-        controls.zoomSpeed = 1.0;  // Regular zoom speed
-        controls.minDistance = 0.1;  // Can zoom in very close
-        controls.maxDistance = distance * 5;  // Can zoom out further
-        controls.enablePan = true;  // Allow panning
-        controls.panSpeed = 0.8;  // Pan speed
-        
-        // Enhanced Lighting for smoother, less rigid appearance
-        const ambientLight = new THREE.AmbientLight(0xffffff, 1.0);  // Increased ambient for softer shadows
-        scene.add(ambientLight);
-        
-        // Main directional light - softer
-        const directionalLight = new THREE.DirectionalLight(0xffffff, 0.8);
-        directionalLight.position.set(50, 80, 50);
-        directionalLight.castShadow = true;
-        scene.add(directionalLight);
-        
-        // Additional lights for smoother shading
-        const directionalLight2 = new THREE.DirectionalLight(0xffffff, 0.6);
-        directionalLight2.position.set(-50, 50, -50);
-        scene.add(directionalLight2);
-        
-        // Fill light from below to reduce harsh shadows
-        const directionalLight3 = new THREE.DirectionalLight(0xffffff, 0.4);
-        directionalLight3.position.set(0, -50, 0);
-        scene.add(directionalLight3);
-        
-        // Point light for additional smoothness
-        const pointLight = new THREE.PointLight(0xffffff, 0.6);
-        pointLight.position.set(0, 100, 0);
-        scene.add(pointLight);
-        
-        // Load GLTF model
-        const loader = new GLTFLoader();
-        console.log('Loading GLTF file: {gltf_filename}');
-        loader.load('{gltf_filename}', function(gltf) {{
-            console.log('GLTF loaded successfully:', gltf);
-            model = gltf.scene;
-            scene.add(model);
-            
-            // Center and scale model
-            const box = new THREE.Box3().setFromObject(model);
-            box.expandByObject(model);
-            const center = box.getCenter(new THREE.Vector3());
-            const size = box.getSize(new THREE.Vector3());
-            
-            console.log('Model bounds:', box);
-            console.log('Center:', center);
-            console.log('Size:', size);
-            console.log('Model children:', model.children.length);
-            
-            // Update camera to fit model - zoom in more on load
-            if (size.length() > 0) {{
-                const maxDim = Math.max(size.x, size.y, size.z);
-                // Calculate distance to fit model in viewport (zoom in more)
-                // Use a smaller multiplier to zoom in closer
-                const distance = maxDim * 0.9;  // Reduced to 0.9 for very close zoom
-                // Position camera at an angle above and in front
-                camera.position.set(
-                    center.x + distance * 0.7,
-                    center.y + distance * 0.5,
-                    center.z + distance * 0.7
-                );
-                camera.lookAt(center);
-                controls.target.copy(center);
-                controls.update();
-            }}
-        }}, function(progress) {{
-            console.log('Loading progress:', progress);
-        }}, function(error) {{
-            console.error('Error loading model:', error);
-            document.getElementById('info').innerHTML = '<h3>Error Loading Model</h3><p>' + error + '</p>';
-        }});
-        
-        // Animation loop
-        function animate() {{
-            requestAnimationFrame(animate);
-            controls.update();
-            renderer.render(scene, camera);
-        }}
-        animate();
-        
-        // Window resize
-        window.addEventListener('resize', function() {{
-            camera.aspect = window.innerWidth / window.innerHeight;
-            camera.updateProjectionMatrix();
-            renderer.setPixelRatio(Math.min(window.devicePixelRatio, 2));
-            renderer.setSize(window.innerWidth, window.innerHeight);
-        }});
-        
-        // Snapshot function
-        function takeSnapshot(viewName) {{
-            if (!model) return;
-            
-            // Get model bounds
-            const box = new THREE.Box3().setFromObject(model);
-            box.expandByObject(model);
-            const center = box.getCenter(new THREE.Vector3());
-            const size = box.getSize(new THREE.Vector3());
-            const maxDim = Math.max(size.x, size.y, size.z);
-            const distance = maxDim * 0.9;  // Use same close distance as initial load
-            
-            // Calculate camera position based on view
-            let camPos;
-            if (viewName === 'front_30deg') {{
-                // 30 degree perspective from front (rotated 30 degrees around Y axis)
-                const angleRad = 30 * Math.PI / 180;
-                camPos = new THREE.Vector3(
-                    center.x + distance * Math.sin(angleRad),
-                    center.y + distance * 0.3,  // Slightly elevated
-                    center.z + distance * Math.cos(angleRad)
-                );
-            }} else if (viewName === 'side') {{
-                // Regular side view (from right side)
-                camPos = new THREE.Vector3(center.x + distance, center.y, center.z);
-            }} else if (viewName === 'front') {{
-                // Front view (looking along +Z axis)
-                camPos = new THREE.Vector3(center.x, center.y, center.z + distance);
-            }} else if (viewName === 'back') {{
-                // Back view (looking along -Z axis)
-                camPos = new THREE.Vector3(center.x, center.y, center.z - distance);
-            }} else {{
-                return;
-            }}
-            
-            // Set camera position and update
-            camera.position.copy(camPos);
-            camera.lookAt(center);
-            controls.target.copy(center);
-            controls.update();
-            
-            // Wait a frame for camera to update, then capture
-            requestAnimationFrame(() => {{
-                requestAnimationFrame(() => {{
-                    // Render frame
-                    renderer.render(scene, camera);
-                    
-                    // Capture screenshot
-                    const dataURL = renderer.domElement.toDataURL('image/png');
-                    
-                    // Download image
-                    const link = document.createElement('a');
-                    const filename = '{gltf_filename}'.replace('.gltf', '') + '_' + viewName + '.png';
-                    link.download = filename;
-                    link.href = dataURL;
-                    link.click();
-                    console.log('Snapshot saved: ' + filename);
-                }});
-            }});
-        }}
-        
-        // Take all snapshots
-        function takeAllSnapshots() {{
-            if (!model) {{
-                alert('Model not loaded yet!');
-                return;
-            }}
-            console.log('Taking snapshots...');
-            // Space out snapshots to allow camera to update
-            setTimeout(() => takeSnapshot('front_30deg'), 100);
-            setTimeout(() => takeSnapshot('side'), 2000);
-            setTimeout(() => takeSnapshot('front'), 4000);
-            setTimeout(() => takeSnapshot('back'), 6000);
-        }}
-        
-        // Control functions
-        function resetCamera() {{
-            const resetDistance = {distance} * 2.5;  // Increased reset distance
-            camera.position.set({cx} + resetDistance * 0.7, {cy} + resetDistance * 0.5, {cz} + resetDistance * 0.7);
-            camera.lookAt({cx}, {cy}, {cz});
-            controls.target.set({cx}, {cy}, {cz});
-            controls.update();
-        }}
-        
-        function toggleWireframe() {{
-            wireframe = !wireframe;
-            if (model) {{
-                model.traverse(function(child) {{
-                    if (child.isMesh) {{
-                        child.material.wireframe = wireframe;
-                    }}
-                }});
-            }}
-        }}
-        
-        // Make functions global for button onclick handlers
-        window.resetCamera = resetCamera;
-        window.toggleWireframe = toggleWireframe;
-        window.takeAllSnapshots = takeAllSnapshots;
-    </script>
-</body>
-</html>"""
-        
-        return html_content
\ No newline at end of file
+    def export_to_gltf(self, output_path: str):
+        return export_blocks_to_gltf(output_path, *self.export_arrays())
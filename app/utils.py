@@ -3,8 +3,19 @@ import secrets
 import string
 import shutil
 import gc
+import os
+import sys
+import time
+import subprocess
+import hashlib
+import traceback
+import psutil
 import asyncio
-import aiofiles
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
 from typing import Optional
 import httpx
@@ -12,24 +23,138 @@ import base64
 import re
 
 try:
+    from orjson import loads as _json_loads  # Parses response bytes directly
+except ImportError:  # Optional: stdlib json accepts the same bytes, just slower
+    from json import loads as _json_loads
+
+# R2_ENDPOINT_URL is read as config.R2_ENDPOINT_URL when the S3 client is first built,
+# so importing this module doesn't trigger config's lazy __getattr__
+try:
+    import config
     from config import (
         WEB_SERVER_URL_PRIMARY, WEB_SERVER_URL_FALLBACK, WEB_SERVER_SECRET,
         R2_ACCOUNT_ID, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY, R2_BUCKET_NAME,
-        R2_ENDPOINT_URL, R2_PUBLIC_URL
+        R2_PUBLIC_URL
     )
 except ImportError:
+    from . import config
     from .config import (
         WEB_SERVER_URL_PRIMARY, WEB_SERVER_URL_FALLBACK, WEB_SERVER_SECRET,
         R2_ACCOUNT_ID, R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY, R2_BUCKET_NAME,
-        R2_ENDPOINT_URL, R2_PUBLIC_URL
+        R2_PUBLIC_URL
     )
 
 _current_server_url = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, so backend calls reuse pooled keep-alive connections"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        )
+    return _http_client
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+# Blocking boto3 uploads get their own threads, so a long R2 transfer can't occupy the
+# loop's default executor (shared with getaddrinfo and asyncio.to_thread)
+_r2_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='r2-upload')
+
+def _get_s3_client():
+    """
+    Get the shared R2 S3 client, built once on first use (parsing botocore's service model
+    is slow) so uploads reuse its connection pool. Called from executor threads.
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                import boto3
+                from botocore.config import Config
+                _s3_client = boto3.client(
+                    's3',
+                    endpoint_url=config.R2_ENDPOINT_URL,
+                    aws_access_key_id=R2_ACCESS_KEY_ID,
+                    aws_secret_access_key=R2_SECRET_ACCESS_KEY,
+                    region_name='auto',
+                    config=Config(max_pool_connections=16, retries={'max_attempts': 3, 'mode': 'standard'})
+                )
+    return _s3_client
+
+def async_ttl_cache(ttl: float, maxsize: Optional[int] = None):
+    """
+    Cache an async function's result per argument tuple for `ttl` seconds,
+    evicting least recently used entries beyond `maxsize`.
+    Exceptions and None (the helpers' failure value) are not cached. Concurrent misses
+    for the same arguments share one call; misses for different arguments run in parallel.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+        inflight = {}  # args -> Future of the call currently computing them
+
+        def lookup(args):
+            entry = cache.get(args)
+            if entry and entry[1] > time.monotonic():
+                cache.move_to_end(args)
+                return entry
+            return None
+
+        def store(args, value):
+            cache[args] = (value, time.monotonic() + ttl)
+            cache.move_to_end(args)
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        @functools.wraps(func)
+        async def wrapper(*args):
+            entry = lookup(args)
+            if entry:
+                return entry[0]
+            # No await between the lookups and the insert, so this needs no lock
+            fut = inflight.get(args)
+            if fut is not None:
+                return await asyncio.shield(fut)
+            fut = asyncio.get_running_loop().create_future()
+            # Mark the exception retrieved so a failure nobody waited on isn't logged twice
+            fut.add_done_callback(lambda f: f.exception())
+            inflight[args] = fut
+            try:
+                value = await func(*args)
+            except asyncio.CancelledError:
+                # Waiters get None, the failure value, rather than the owner's cancellation
+                fut.set_result(None)
+                raise
+            except Exception as e:
+                cache.pop(args, None)
+                fut.set_exception(e)
+                raise
+            finally:
+                inflight.pop(args, None)
+            if value is None:
+                cache.pop(args, None)
+            else:
+                store(args, value)
+            fut.set_result(value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_set = lambda *args, value: store(args, value)
+        return wrapper
+    return decorator
+
+_MODEL_ID_ALPHABET = (string.ascii_letters + string.digits).encode('ascii')
 
 def generate_model_id() -> str:
     """Generate a unique 12-character model ID"""
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(12))
+    # One urandom call per 16 bytes instead of one secrets.choice per character; bytes
+    # >= 248 (4 * 62) are skipped so every character stays equally likely
+    model_id = bytearray()
+    while len(model_id) < 12:
+        model_id.extend(_MODEL_ID_ALPHABET[b % 62] for b in secrets.token_bytes(16) if b < 248)
+    return model_id[:12].decode('ascii')
 
 async def upload_gltf_to_server(gltf_path: str, model_id: str, build_filename: Optional[str] = None, build_size: Optional[int] = None, build_hash: Optional[str] = None) -> Optional[str]:
     """
@@ -38,8 +163,7 @@ async def upload_gltf_to_server(gltf_path: str, model_id: str, build_filename: O
     For files > 2MB, uploads directly to R2 (bypasses web server file size limits)
     """
     try:
-        import os
-        # Read file asynchronously in chunks to avoid loading entire file into memory
+        # Size picks the upload route; the chosen helper streams the file from disk
         file_size = os.path.getsize(gltf_path)
         
         # For files > 2MB, upload directly to R2 (bypasses PythonAnywhere 2MB limit and Vercel 4.5MB limit)
@@ -47,11 +171,11 @@ async def upload_gltf_to_server(gltf_path: str, model_id: str, build_filename: O
         if file_size > 2 * 1024 * 1024:  # 2MB
             print(f"File size ({file_size / 1024 / 1024:.1f}MB) exceeds web server limits, uploading directly to R2")
             # Upload directly to R2
-            r2_url = await upload_gltf_direct_to_r2(gltf_path, model_id)
+            r2_url = await upload_gltf_direct_to_r2(gltf_path, model_id, file_size=file_size)
             if not r2_url:
                 print("Direct R2 upload failed, falling back to web server upload")
                 # Fall back to web server upload (will try Vercel)
-                return await _upload_via_web_server(gltf_path, model_id, build_filename, build_size, build_hash)
+                return await _upload_via_web_server(gltf_path, model_id, build_filename, build_size, build_hash, file_size=file_size)
             
             # Register model with backend using R2 URL
             viewer_url = await register_model_with_r2_url(
@@ -60,39 +184,20 @@ async def upload_gltf_to_server(gltf_path: str, model_id: str, build_filename: O
             return viewer_url
         else:
             # For files <= 2MB, use web server upload (faster for small files)
-            return await _upload_via_web_server(gltf_path, model_id, build_filename, build_size, build_hash)
+            return await _upload_via_web_server(gltf_path, model_id, build_filename, build_size, build_hash, file_size=file_size)
     except Exception as e:
         print(f"Error uploading GLTF: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
-async def _upload_via_web_server(gltf_path: str, model_id: str, build_filename: Optional[str] = None, build_size: Optional[int] = None, build_hash: Optional[str] = None) -> Optional[str]:
+async def _upload_via_web_server(gltf_path: str, model_id: str, build_filename: Optional[str] = None, build_size: Optional[int] = None, build_hash: Optional[str] = None, file_size: Optional[int] = None) -> Optional[str]:
     """
     Upload GLTF file via web server (for files <= 2MB)
     Returns the viewer URL if successful, None otherwise
     """
     try:
-        import os
-        file_size = os.path.getsize(gltf_path)
-        
-        # Use async file reading for better concurrency
-        if file_size < 10 * 1024 * 1024:
-            # For small files (<10MB), read directly
-            gltf_data = await read_file_async(Path(gltf_path))
-        else:
-            # For larger files, read in chunks asynchronously
-            gltf_data = b''
-            async with aiofiles.open(gltf_path, 'rb') as f:
-                while True:
-                    chunk = await f.read(1024 * 1024)  # 1MB chunks
-                    if not chunk:
-                        break
-                    gltf_data += chunk
-        
-        files = {
-            'gltf': (f"{model_id}.gltf", gltf_data, 'model/gltf+json')
-        }
+        if file_size is None:
+            file_size = os.path.getsize(gltf_path)
         
         data = {
             'model_id': model_id,
@@ -116,24 +221,30 @@ async def _upload_via_web_server(gltf_path: str, model_id: str, build_filename:
         # Increase timeout for larger files
         timeout = 120.0 if file_size > 10 * 1024 * 1024 else 60.0
         
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        client = get_http_client()
+        # httpx streams the multipart body from the open file in chunks instead of a copy
+        # held in memory, and rewinds it if the upload has to be retried on the fallback
+        with open(gltf_path, 'rb') as gltf_file:
+            files = {
+                'gltf': (f"{model_id}.gltf", gltf_file, 'model/gltf+json')
+            }
             try:
                 response = await client.post(
                     f"{server_url}/api/upload",
                     files=files,
                     data=data,
-                    headers=headers
+                    headers=headers,
+                    timeout=timeout
                 )
                 response.raise_for_status()
-                result = response.json()
-                # Clear data from memory
-                del gltf_data
-                
+                result = _json_loads(response.content)
+                mark_server_healthy(server_url)
+                    
                 viewer_url = result.get('url')
-                
+                    
                 # Preview will be generated client-side by viewer.js
                 # No server-side generation needed
-                
+                    
                 return viewer_url
             except httpx.HTTPStatusError as e:
                 # If we get a 413 (Payload Too Large) or 502/503 (Web Server Unavailable)
@@ -146,17 +257,17 @@ async def _upload_via_web_server(gltf_path: str, model_id: str, build_filename:
                         f"{server_url}/api/upload",
                         files=files,
                         data=data,
-                        headers=headers
+                        headers=headers,
+                        timeout=timeout
                     )
                     response.raise_for_status()
-                    result = response.json()
-                    del gltf_data
+                    result = _json_loads(response.content)
                     return result.get('url')
                 else:
                     raise
     except Exception as e:
         print(f"Error uploading GLTF: {e}")
-        import traceback
+        invalidate_server_url(e)
         traceback.print_exc()
         return None
 
@@ -164,14 +275,25 @@ async def check_web_server_health(server_url: Optional[str] = None) -> bool:
     """Check if the web server is available"""
     url = server_url or WEB_SERVER_URL_PRIMARY
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{url}/health")
-            return response.status_code == 200
+        client = get_http_client()
+        # Reachability only needs the status line; HEAD skips the stats body. Pooled
+        # keep-alive connections make repeat probes a single round trip
+        response = await client.head(f"{url}/health", timeout=5.0)
+        if response.status_code in (405, 501):
+            # Server without HEAD support on /health
+            response = await client.get(f"{url}/health", timeout=5.0)
+        return response.status_code == 200
     except:
         return False
 
 async def get_active_server_url() -> str:
     """Get the active server URL (primary if available, fallback otherwise)"""
+    # Both down: return primary anyway (requests to it will fail gracefully)
+    return await _find_active_server_url() or WEB_SERVER_URL_PRIMARY
+
+@async_ttl_cache(ttl=30)
+async def _find_active_server_url() -> Optional[str]:
+    """The first healthy server URL, or None (not cached) if both are down"""
     global _current_server_url
     
     # If we have a cached active URL, check if it's still working
@@ -182,28 +304,49 @@ async def get_active_server_url() -> str:
             # Cached URL is down, clear it
             _current_server_url = None
     
-    # Try primary server first
-    if await check_web_server_health(WEB_SERVER_URL_PRIMARY):
-        _current_server_url = WEB_SERVER_URL_PRIMARY
-        return WEB_SERVER_URL_PRIMARY
-    
-    # Primary failed, try fallback
-    if await check_web_server_health(WEB_SERVER_URL_FALLBACK):
-        _current_server_url = WEB_SERVER_URL_FALLBACK
-        return WEB_SERVER_URL_FALLBACK
-    
-    # Both failed, return primary anyway (will fail gracefully)
-    return WEB_SERVER_URL_PRIMARY
+    # Probe both servers at once, still preferring the primary: if it's down, the fallback's
+    # answer is already in by then instead of costing a second timeout. No fallback probe
+    # when there is no distinct fallback (an empty URL would just probe the primary again)
+    fallback_probe = None
+    if WEB_SERVER_URL_FALLBACK and WEB_SERVER_URL_FALLBACK != WEB_SERVER_URL_PRIMARY:
+        fallback_probe = asyncio.create_task(check_web_server_health(WEB_SERVER_URL_FALLBACK))
+    try:
+        if await check_web_server_health(WEB_SERVER_URL_PRIMARY):
+            _current_server_url = WEB_SERVER_URL_PRIMARY
+            return WEB_SERVER_URL_PRIMARY
+        
+        # Primary failed, use fallback
+        if fallback_probe is not None and await fallback_probe:
+            _current_server_url = WEB_SERVER_URL_FALLBACK
+            return WEB_SERVER_URL_FALLBACK
+    finally:
+        if fallback_probe is not None:
+            fallback_probe.cancel()
+    return None
 
-async def write_file_async(file_path: Path, content: bytes):
-    """Write file asynchronously to avoid blocking"""
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(content)
+def invalidate_server_url(error: Optional[BaseException] = None):
+    """
+    Drop the cached active server URL so the next get_active_server_url() re-probes.
+    With an error, only connection-level failures and 5xx responses invalidate; a 4xx
+    means the server is up and rejected the request.
+    """
+    global _current_server_url
+    if error is not None and not (
+        isinstance(error, httpx.TransportError)
+        or (isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500)
+    ):
+        return
+    _current_server_url = None
+    _find_active_server_url.cache_clear()
 
-async def read_file_async(file_path: Path) -> bytes:
-    """Read file asynchronously to avoid blocking"""
-    async with aiofiles.open(file_path, 'rb') as f:
-        return await f.read()
+def mark_server_healthy(server_url: str):
+    """
+    Record a successful backend response from server_url as a fresh health check,
+    so get_active_server_url() skips its /health probe for another TTL window.
+    """
+    global _current_server_url
+    _current_server_url = server_url
+    _find_active_server_url.cache_set(value=server_url)
 
 def calculate_memory_usage(build_file_size: int) -> int:
     """
@@ -230,10 +373,11 @@ def calculate_memory_usage(build_file_size: int) -> int:
 def cleanup_temp_files(path: Path):
     """Clean up temporary files and directories"""
     try:
-        if path.is_file():
-            path.unlink()
-        elif path.is_dir():
+        if path.is_dir():
+            # rmtree walks the tree with os.scandir, so entries aren't stat'ed one by one
             shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
     except:
         pass
 
@@ -241,48 +385,125 @@ def force_garbage_collection():
     """Force garbage collection to free memory (Railway optimization)"""
     gc.collect()
 
-async def get_usage_stats() -> dict:
-    """Get R2 usage stats from backend (no R2 API call - from local tracker)"""
+MEMORY_NORMAL = "NORMAL"
+MEMORY_WARN = "WARN"
+MEMORY_CRITICAL = "CRITICAL"
+
+_PSI_MEMORY_PATH = "/proc/pressure/memory"
+_pressure_cache = (MEMORY_NORMAL, 0.0)
+
+def _read_memory_pressure() -> str:
+    """Read the current memory pressure level without caching"""
+    # Linux: PSI reports the share of time tasks were stalled waiting on memory
+    if os.path.exists(_PSI_MEMORY_PATH):
+        try:
+            with open(_PSI_MEMORY_PATH) as f:
+                avg10 = {
+                    line.split()[0]: float(line.split()[1].split('=')[1])
+                    for line in f if line.strip()
+                }
+            if avg10.get('full', 0.0) >= 10 or avg10.get('some', 0.0) >= 40:
+                return MEMORY_CRITICAL
+            if avg10.get('some', 0.0) >= 10:
+                return MEMORY_WARN
+            return MEMORY_NORMAL
+        except (OSError, ValueError, IndexError):
+            pass
+
+    # macOS: 1 = normal, 2 = warn, 4 = critical
+    if sys.platform == "darwin":
+        try:
+            out = subprocess.run(
+                ["sysctl", "-n", "kern.memorystatus_vm_pressure_level"],
+                capture_output=True, text=True, timeout=1
+            ).stdout.strip()
+            return {"4": MEMORY_CRITICAL, "2": MEMORY_WARN}.get(out, MEMORY_NORMAL)
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    # No pressure interface: fall back to used memory percentage
+    percent = psutil.virtual_memory().percent
+    if percent > 95:
+        return MEMORY_CRITICAL
+    if percent > 85:
+        return MEMORY_WARN
+    return MEMORY_NORMAL
+
+def memory_pressure_level() -> str:
+    """Get the memory pressure level (MEMORY_NORMAL/WARN/CRITICAL), cached for 5 seconds"""
+    global _pressure_cache
+    level, expires = _pressure_cache
+    now = time.monotonic()
+    if now >= expires:
+        level = _read_memory_pressure()
+        _pressure_cache = (level, now + 5)
+    return level
+
+@async_ttl_cache(ttl=10)
+async def get_usage_stats() -> Optional[dict]:
+    """
+    Get R2 usage stats from backend (no R2 API call - from local tracker)
+    Returns None (not cached) if the backend can't be reached
+    """
     server_url = await get_active_server_url()
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{server_url}/health")
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('r2_usage', {})
-    except:
-        pass
-    return {}
+        client = get_http_client()
+        response = await client.get(f"{server_url}/health", timeout=5.0)
+        if response.status_code == 200:
+            mark_server_healthy(server_url)
+            data = _json_loads(response.content)
+            return data.get('r2_usage', {})
+    except Exception as e:
+        invalidate_server_url(e)
+    return None
 
+@async_ttl_cache(ttl=5)
 async def get_cached_builds() -> Optional[list]:
     """Get ALL cached builds from backend (not just 1)"""
     server_url = await get_active_server_url()
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(
-                f"{server_url}/api/builds",
-                headers={'X-API-Secret': WEB_SERVER_SECRET}
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("builds", [])
+        client = get_http_client()
+        response = await client.get(
+            f"{server_url}/api/builds",
+            headers={'X-API-Secret': WEB_SERVER_SECRET},
+            timeout=15.0
+        )
+        response.raise_for_status()
+        data = _json_loads(response.content)
+        mark_server_healthy(server_url)
+        return data.get("builds", [])
     except Exception as e:
         print(f"Error fetching cached builds: {e}")
+        invalidate_server_url(e)
+        return None
+
+async def get_cached_build_by_index(index: int) -> Optional[dict]:
+    """
+    Get a single cached build by its 1-based index in the get_cached_builds() listing
+    (shares that listing's 5s cache with /builds; the backend has no per-index endpoint)
+    Returns {'build': dict or None, 'total': int} if successful, None otherwise
+    """
+    builds = await get_cached_builds()
+    if builds is None:
         return None
+    build = builds[index - 1] if 1 <= index <= len(builds) else None
+    return {'build': build, 'total': len(builds)}
 
 def calculate_build_hash(build_content: bytes) -> str:
     """Calculate SHA-1 hash of build file content for deterministic caching"""
-    import hashlib
     return hashlib.sha1(build_content).hexdigest()
 
-async def check_build_cache(model_id: str) -> Optional[dict]:
+@async_ttl_cache(ttl=5, maxsize=1024)
+async def check_build_cache(build_hash: str) -> Optional[dict]:
+    """Find a cached build by the SHA-1 hash of its content (renamed copies still hit)"""
     builds = await get_cached_builds()
     if not builds:
         return None
     
     for entry in builds:
-        if entry.get("id") == model_id:
-            return entry
+        if entry.get("build_hash") == build_hash:
+            # Callers look the cached model up by 'model_id'
+            return {**entry, "model_id": entry.get("model_id", entry.get("id"))}
 
     return None
     
@@ -290,50 +511,60 @@ async def delete_model_from_backend(model_id: str) -> bool:
     """Delete a model from backend (R2 and cache)"""
     server_url = await get_active_server_url()
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{server_url}/api/delete",
-                json={'model_id': model_id},
-                headers={
-                    'X-API-Secret': WEB_SERVER_SECRET,
-                    'Content-Type': 'application/json'
-                }
-            )
-            if response.status_code == 200:
-                return True
+        client = get_http_client()
+        response = await client.post(
+            f"{server_url}/api/delete",
+            json={'model_id': model_id},
+            headers={
+                'X-API-Secret': WEB_SERVER_SECRET,
+                'Content-Type': 'application/json'
+            },
+            timeout=10.0
+        )
+        if response.status_code == 200:
+            mark_server_healthy(server_url)
+            get_cached_builds.cache_clear()
+            check_build_cache.cache_clear()
+            return True
     except Exception as e:
         print(f"Error deleting model: {e}")
+        invalidate_server_url(e)
     return False
 
-async def upload_gltf_direct_to_r2(gltf_path: str, model_id: str) -> Optional[str]:
+async def upload_gltf_direct_to_r2(gltf_path: str, model_id: str, file_size: Optional[int] = None) -> Optional[str]:
     """
     Upload GLTF file directly to R2 from the bot (bypasses web server file size limits)
     Returns the public R2 URL if successful, None otherwise
     Supports files up to 100MB (R2 free tier limit is much higher)
     """
     try:
-        import boto3
+        from boto3.s3.transfer import TransferConfig
         from botocore.exceptions import ClientError
-        import os
         
-        file_size = os.path.getsize(gltf_path)
+        if file_size is None:
+            file_size = os.path.getsize(gltf_path)
         print(f"Uploading {model_id}.gltf directly to R2 (size: {file_size / 1024 / 1024:.1f}MB)")
         
         # Run boto3 operations in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
         def _upload_to_r2():
-            # Create S3 client for R2
-            s3_client = boto3.client(
-                's3',
-                endpoint_url=R2_ENDPOINT_URL,
-                aws_access_key_id=R2_ACCESS_KEY_ID,
-                aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-                region_name='auto'
-            )
+            s3_client = _get_s3_client()
             
             key = f"{model_id}.gltf"
             
+            # Multipart in 8MB parts on up to 4 threads, but no more threads than parts; the
+            # default of 10 can hold ~80MB of parts in flight
+            chunk_size = 8 * 1024 * 1024
+            part_count = max(1, -(-file_size // chunk_size))
+            transfer_config = TransferConfig(
+                multipart_threshold=chunk_size,
+                multipart_chunksize=chunk_size,
+                max_concurrency=min(4, part_count),
+                max_io_queue=8,
+                use_threads=True
+            )
+            
             # Upload file using streaming to avoid loading entire file into memory
             with open(gltf_path, 'rb') as file_obj:
                 s3_client.upload_fileobj(
@@ -343,13 +574,14 @@ async def upload_gltf_direct_to_r2(gltf_path: str, model_id: str) -> Optional[st
                     ExtraArgs={
                         'ContentType': 'model/gltf+json',
                         'CacheControl': 'public, max-age=31536000'  # 1 year cache
-                    }
+                    },
+                    Config=transfer_config
                 )
             
             return f"{R2_PUBLIC_URL}/{key}"
         
         # Run upload in executor
-        public_url = await loop.run_in_executor(None, _upload_to_r2)
+        public_url = await loop.run_in_executor(_r2_executor, _upload_to_r2)
         print(f"Successfully uploaded {model_id}.gltf directly to R2: {public_url}")
         return public_url
         
@@ -358,7 +590,6 @@ async def upload_gltf_direct_to_r2(gltf_path: str, model_id: str) -> Optional[st
         return None
     except Exception as e:
         print(f"Unexpected error uploading directly to R2: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -389,24 +620,39 @@ async def register_model_with_r2_url(model_id: str, r2_url: str, build_filename:
             'X-API-Secret': WEB_SERVER_SECRET
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{server_url}/api/register",
-                json=data,
-                headers=headers
-            )
-            response.raise_for_status()
-            result = response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{server_url}/api/register",
+            json=data,
+            headers=headers,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        result = _json_loads(response.content)
+        mark_server_healthy(server_url)
             
-            viewer_url = result.get('url')
-            return viewer_url
+        viewer_url = result.get('url')
+        return viewer_url
             
     except Exception as e:
         print(f"Error registering model with R2 URL: {e}")
-        import traceback
+        invalidate_server_url(e)
         traceback.print_exc()
         return None
 
+_PNG_DATA_URL_PREFIX = b"data:image/png;base64,"
+_BASE64_RUN_RE = re.compile(rb"[A-Za-z0-9+/=]*")
+
+def _flowkit_url(gltf_url: str) -> str:
+    """
+    Flowkit snapshot URL for a GLTF. The readiness probe and the real fetch must use the
+    same one, since Flowkit caches renders by URL. Parameters:
+      rh = horizontal rotation (145)
+      rv = vertical rotation (30)
+      s  = size (512)
+    """
+    return f"https://www.flowkit.app/s/demo/r/rh:145,rv:30,s:512/u/{gltf_url}"
+
 async def generate_preview_with_flowkit(model_id: str, gltf_url: str) -> Optional[str]:
     """
     Generate preview using Flowkit API and upload to R2
@@ -414,49 +660,46 @@ async def generate_preview_with_flowkit(model_id: str, gltf_url: str) -> Optiona
     Based on test_cframe.py logic
     """
     try:
-        # Flowkit snapshot endpoint with parameters:
-        #   rh = horizontal rotation (-45)
-        #   rv = vertical rotation (15)
-        #   s  = size (512)
-        #   sh = shadows (false = disable)
-        #   bg = background color in hex (000000 = black)
-        flowkit_url = f"https://www.flowkit.app/s/demo/r/rh:145,rv:30,s:512/u/{gltf_url}"
+        flowkit_url = _flowkit_url(gltf_url)
         
         print(f"[Preview] Generating preview for {model_id} using Flowkit: {flowkit_url}")
         
         # Fetch preview from Flowkit
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(flowkit_url)
-            response.raise_for_status()
+        client = get_http_client()
+        response = await client.get(flowkit_url, timeout=60.0)
+        response.raise_for_status()
             
-            # Extract image data
-            img_data = None
-            content_type = response.headers.get("Content-Type", "")
-            if content_type.startswith("image/"):
-                img_data = response.content
+        # Extract image data
+        img_data = None
+        content_type = response.headers.get("Content-Type", "")
+        if content_type.startswith("image/"):
+            img_data = response.content
+        else:
+            # Scan the raw body (no str copy from response.text): bytes.find for the fixed
+            # prefix, one anchored match for the base64 run, decoded from a view of it
+            body = response.content
+            prefix_at = body.find(_PNG_DATA_URL_PREFIX)
+            if prefix_at >= 0:
+                start = prefix_at + len(_PNG_DATA_URL_PREFIX)
+                end = _BASE64_RUN_RE.match(body, start).end()
+                img_data = base64.b64decode(memoryview(body)[start:end])
             else:
-                text = response.text
-                if "data:image/png;base64," in text:
-                    b64data = re.search(r"data:image/png;base64,([A-Za-z0-9+/=]+)", text).group(1)
-                    img_data = base64.b64decode(b64data)
-                else:
-                    raise ValueError("Unexpected response type from Flowkit")
+                raise ValueError("Unexpected response type from Flowkit")
             
-            if not img_data:
-                raise ValueError("Failed to extract image data from Flowkit response")
+        if not img_data:
+            raise ValueError("Failed to extract image data from Flowkit response")
             
-            print(f"[Preview] Preview generated, size: {len(img_data)} bytes")
+        print(f"[Preview] Preview generated, size: {len(img_data)} bytes")
             
-            # Upload preview to R2
-            preview_url = await upload_preview_to_r2(model_id, img_data)
-            return preview_url
+        # Upload preview to R2
+        preview_url = await upload_preview_to_r2(model_id, img_data)
+        return preview_url
             
     except httpx.RequestError as e:
         print(f"[Preview] Flowkit request error for {model_id}: {e}")
         return None
     except Exception as e:
         print(f"[Preview] Error generating preview for {model_id}: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -466,24 +709,15 @@ async def upload_preview_to_r2(model_id: str, img_data: bytes) -> Optional[str]:
     Returns preview URL if successful, None otherwise
     """
     try:
-        import boto3
         from botocore.exceptions import ClientError
-        from io import BytesIO
         
         print(f"Uploading preview for {model_id} to R2 (size: {len(img_data)} bytes)")
         
         # Run boto3 operations in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
         def _upload_preview():
-            # Create S3 client for R2
-            s3_client = boto3.client(
-                's3',
-                endpoint_url=R2_ENDPOINT_URL,
-                aws_access_key_id=R2_ACCESS_KEY_ID,
-                aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-                region_name='auto'
-            )
+            s3_client = _get_s3_client()
             
             preview_key = f"{model_id}_preview.png"
             
@@ -502,7 +736,7 @@ async def upload_preview_to_r2(model_id: str, img_data: bytes) -> Optional[str]:
             return f"{R2_PUBLIC_URL}/{preview_key}"
         
         # Run upload in executor
-        preview_url = await loop.run_in_executor(None, _upload_preview)
+        preview_url = await loop.run_in_executor(_r2_executor, _upload_preview)
         print(f"Successfully uploaded preview for {model_id} to R2: {preview_url}")
         return preview_url
         
@@ -511,7 +745,6 @@ async def upload_preview_to_r2(model_id: str, img_data: bytes) -> Optional[str]:
         return None
     except Exception as e:
         print(f"Unexpected error uploading preview to R2: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -521,20 +754,27 @@ async def check_preview_ready(gltf_url: str) -> bool:
     Returns True if preview is ready, False otherwise
     """
     try:
-        flowkit_url = f"https://www.flowkit.app/s/demo/r/rh:-45,rv:15,s:512,sh:false,bg:000000/u/{gltf_url}"
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(flowkit_url)
-            if response.status_code == 200:
-                content_type = response.headers.get("Content-Type", "")
-                if content_type.startswith("image/"):
-                    return True
-                text = response.text
-                if "data:image/png;base64," in text:
-                    return True
-        return False
+        client = get_http_client()
+        # Same URL as the real fetch, so a successful probe warms its cache entry; an image
+        # response is judged from its headers without downloading the body
+        async with client.stream('GET', _flowkit_url(gltf_url), timeout=10.0) as response:
+            if response.status_code != 200:
+                return False
+            content_type = response.headers.get("Content-Type", "")
+            if content_type.startswith("image/"):
+                return True
+            body = await response.aread()
+            return _PNG_DATA_URL_PREFIX in body
     except:
         return False
 
+async def wait_for_preview_ready(gltf_url: str, delays=(1, 2, 4, 8)) -> bool:
+    """Poll check_preview_ready with exponential backoff; True once the preview is ready"""
+    for delay in delays:
+        await asyncio.sleep(delay)
+        if await check_preview_ready(gltf_url):
+            return True
+    return False
+
 
 